@@ -1,51 +1,168 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
 from . import models
 
+# Abaixo disso o COUNT(*) exato é barato o suficiente.
+ESTIMATE_THRESHOLD = 10_000
+
+
+def _estimated_rows(model, using) -> int | None:
+    """Total aproximado de linhas da tabela, sem varrê-la."""
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        elif connection.vendor == "sqlite":
+            # Lido da PK (busca binária); superestima se houve muitas remoções.
+            cursor.execute(f"SELECT MAX({connection.ops.quote_name(model._meta.pk.column)}) FROM {table}")
+        else:
+            return None
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator das changelists grandes: sem filtros do usuário, estima o total
+    em vez de rodar um COUNT(*) na tabela inteira a cada página.
+
+    A estimativa pode passar do total real (no SQLite, depois de remoções):
+    uma página que volta incompleta marca o fim de verdade e corrige o total
+    sem consulta extra; só uma página já além do fim paga o COUNT exato, e
+    então é servida a última página real em vez de uma lista vazia.
+    """
+    estimated = False
+
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        if isinstance(qs, QuerySet) and qs.query.where == qs.model._default_manager.all().query.where:
+            estimate = _estimated_rows(qs.model, qs.db)
+            if estimate is not None and estimate > ESTIMATE_THRESHOLD:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def _set_count(self, count: int) -> None:
+        self.__dict__["count"] = count
+        self.__dict__.pop("num_pages", None)
+        self.estimated = False
+
+    def page(self, number):
+        page = super().page(number)
+        if not self.estimated:
+            return page
+        rows = list(page.object_list)
+        if len(rows) < self.per_page:
+            bottom = (page.number - 1) * self.per_page
+            if rows or page.number == 1:
+                self._set_count(bottom + len(rows))
+            else:
+                self._set_count(self.object_list.count())
+                return super().page(self.num_pages)
+        return self._get_page(rows, page.number, self)
+
+    def get_elided_page_range(self, number=1, **kwargs):
+        # O admin passa o ?p= pedido, que pode ter ficado além do total corrigido.
+        return super().get_elided_page_range(min(int(number), self.num_pages), **kwargs)
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
 
 @admin.register(models.Group)
 class GroupAdmin(admin.ModelAdmin):
     list_display = ("name", "slug", "created_by", "created_at")
+    list_select_related = ("created_by",)
     search_fields = ("name", "slug", "description", "created_by__username")
     list_filter = ("created_at",)
+    autocomplete_fields = ("created_by",)
     prepopulated_fields = {"slug": ("name",)}
 
 
 @admin.register(models.GroupMembership)
-class GroupMembershipAdmin(admin.ModelAdmin):
+class GroupMembershipAdmin(LargeTableAdmin):
     list_display = ("user", "group", "role", "joined_at")
+    list_select_related = ("user", "group")
     list_filter = ("role", "joined_at")
     search_fields = ("user__username", "group__name")
+    autocomplete_fields = ("user", "group")
 
 
 @admin.register(models.GroupInvite)
 class GroupInviteAdmin(admin.ModelAdmin):
     list_display = ("group", "invited_user", "email", "token", "created_at", "accepted_at", "revoked_at")
+    list_select_related = ("group", "invited_user")
     list_filter = ("created_at", "accepted_at", "revoked_at")
     search_fields = ("group__name", "invited_user__username", "email", "token")
+    autocomplete_fields = ("group", "invited_by", "invited_user")
 
 
 class GameParticipationInline(admin.TabularInline):
     model = models.GameParticipation
+    autocomplete_fields = ("player",)
     extra = 1
 
 
 @admin.register(models.Game)
-class GameAdmin(admin.ModelAdmin):
+class GameAdmin(LargeTableAdmin):
     list_display = ("__str__", "date", "location", "buy_in", "created_by", "created_at")
-    list_filter = ("date", "created_at")
+    list_select_related = ("created_by",)
+    date_hierarchy = "date"
     search_fields = ("title", "location", "created_by__username")
+    autocomplete_fields = ("created_by",)
     inlines = [GameParticipationInline]
 
 
 @admin.register(models.GamePost)
-class GamePostAdmin(admin.ModelAdmin):
+class GamePostAdmin(LargeTableAdmin):
     list_display = ("game", "group", "posted_by", "posted_at")
-    list_filter = ("posted_at", "group")
+    list_select_related = ("game", "group", "posted_by")
+    # Sem list_filter por grupo: listaria todos os grupos a cada página.
+    # Para filtrar, busque pelo nome ou use ?group__id__exact=<id>.
+    date_hierarchy = "posted_at"
     search_fields = ("game__title", "group__name", "posted_by__username")
+    autocomplete_fields = ("game", "group", "posted_by")
 
 
 @admin.register(models.GameParticipation)
-class GameParticipationAdmin(admin.ModelAdmin):
+class GameParticipationAdmin(LargeTableAdmin):
     list_display = ("game", "player", "final_balance", "created_at")
-    list_filter = ("created_at",)
+    list_select_related = ("game", "player")
+    date_hierarchy = "created_at"
     search_fields = ("game__title", "player__username")
+    autocomplete_fields = ("game", "player")
+
+
+@admin.register(models.PurgeJob)
+class PurgeJobAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "status", "deleted_rows", "total_rows", "progress", "created_at", "finished_at")
+    list_filter = ("status", "target")
+    readonly_fields = [f.name for f in models.PurgeJob._meta.fields]
+
+
+@admin.register(models.AuditEntry)
+class AuditEntryAdmin(LargeTableAdmin):
+    list_display = ("__str__", "actor", "created_at")
+    list_select_related = ("actor",)
+    list_filter = ("action", "model")
+    search_fields = ("=game__id", "=archived_game__id", "=object_id")
+    readonly_fields = [f.name for f in models.AuditEntry._meta.fields]
+
+    # Só acréscimo: o histórico não é editado pelo admin.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
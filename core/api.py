@@ -0,0 +1,353 @@
+"""
+API JSON (v1).
+
+Autenticação pela sessão do site; erros também respondem em JSON.
+
+Os recursos de leitura aceitam ?fields= (seleção esparsa) e paginam por
+cursor (keyset). Cada campo mapeia para um caminho do ORM ou uma anotação:
+a consulta usa values() só com o que foi pedido, então os JOINs, agregações
+e a busca das participações acontecem apenas quando algum campo precisa deles.
+"""
+import base64
+import datetime
+import json
+from functools import wraps
+
+from django.db.models import Count, F, Q
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from . import changelog, crossgroup, rollups
+from .models import Game, GameParticipation, Group, GroupMembership
+
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 1000
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+GROUP_FIELDS = {
+    "id": "id",
+    "slug": "slug",
+    "name": "name",
+    "description": "description",
+    "created_at": "created_at",
+    "created_by": "created_by__username",
+    "member_count": Count("memberships", distinct=True),
+    "game_count": Count("posts", distinct=True),
+}
+GROUP_DEFAULT_FIELDS = ("id", "slug", "name", "created_by", "member_count")
+
+GAME_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "date": "date",
+    "location": "location",
+    "buy_in": "buy_in",
+    "created_at": "created_at",
+    "created_by": "created_by__username",
+    "player_count": Count("participations", distinct=True),
+    "participations": None,  # buscadas à parte, só se pedidas
+}
+GAME_DEFAULT_FIELDS = ("id", "title", "date", "location", "buy_in")
+
+PARTICIPATION_FIELDS = {
+    "id": "id",
+    "player": "player__username",
+    "player_id": "player_id",
+    "final_balance": "final_balance",
+    "rebuy": "rebuy",
+}
+
+STANDING_FIELDS = ("player_id", "player", "games", "wins", "invested", "rebuy", "net")
+
+RESULT_FIELDS = {
+    "game_id": "game_id",
+    "date": "game__date",
+    "title": "game__title",
+    "buy_in": "game__buy_in",
+    "final_balance": "final_balance",
+    "rebuy": "rebuy",
+    "net": crossgroup.NET,
+}
+
+
+def _error(status, message):
+    return JsonResponse({"error": message}, status=status)
+
+
+def api_login_required(view_func):
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return _error(401, "Autenticação necessária.")
+        return view_func(request, *args, **kwargs)
+    return _wrapped_view
+
+
+def _member_group(request, slug):
+    group = Group.objects.only("id", "slug", "change_seq").filter(slug=slug).first()
+    if group is None:
+        return None, _error(404, "Grupo não encontrado.")
+    if not GroupMembership.objects.filter(group=group, user=request.user).exists():
+        return None, _error(403, "Você não é membro deste grupo.")
+    return group, None
+
+
+def _int_param(request, name, default, maximum=None):
+    raw = request.GET.get(name, "")
+    value = int(raw) if raw.isdigit() else default
+    return min(value, maximum) if maximum else value
+
+
+@require_GET
+@api_login_required
+def group_changes_view(request, slug):
+    """
+    Mudanças do grupo depois de ?cursor=N, em páginas de até ?limit= itens.
+    O cliente guarda 'cursor' da resposta e repete enquanto 'has_more'.
+    """
+    group, error = _member_group(request, slug)
+    if error:
+        return error
+
+    cursor = _int_param(request, "cursor", 0)
+    limit = max(1, _int_param(request, "limit", CHANGES_PAGE_SIZE, CHANGES_MAX_PAGE_SIZE))
+    changes, has_more = changelog.changes_since(group.pk, cursor, limit)
+    return JsonResponse({
+        "group": group.slug,
+        "changes": changes,
+        "cursor": changes[-1]["seq"] if changes else cursor,
+        "has_more": has_more,
+        "latest": group.change_seq,
+    })
+
+
+class BadRequest(Exception):
+    pass
+
+
+def _parse_fields(request, spec, default):
+    raw = request.GET.get("fields")
+    if not raw:
+        return list(default)
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in spec]
+    if unknown:
+        raise BadRequest(f"Campos desconhecidos: {', '.join(unknown)}.")
+    return fields
+
+
+def _values(qs, spec, fields, hidden=(), limit=None):
+    """
+    values() com apenas os campos pedidos (mais as chaves de ordenação em
+    'hidden'); anotações e JOINs entram só quando algum campo precisa.
+    Retorna a lista de dicts, com no máximo 'limit' linhas.
+    """
+    names, expressions, renamed = [], {}, {}
+    for name in dict.fromkeys([*fields, *hidden]):
+        source = spec.get(name, name)
+        if source is None:
+            continue
+        if source == name:
+            names.append(name)
+        else:
+            # Apelido próprio: 'created_by', 'player'... colidiriam com os campos do modelo.
+            alias = f"api_{name}"
+            renamed[alias] = name
+            expressions[alias] = F(source) if isinstance(source, str) else source
+    qs = qs.values(*names, **expressions)
+    if limit is not None:
+        qs = qs[:limit]
+    return [{renamed.get(k, k): v for k, v in row.items()} for row in qs]
+
+
+def _encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def _decode_cursor(request, *types):
+    """
+    Chaves do cursor convertidas para 'types' (int ou datetime.date), na
+    ordem em que foram codificadas. Qualquer outro formato é um 400.
+    """
+    raw = request.GET.get("cursor")
+    if not raw:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(raw.encode()))
+        if not isinstance(values, list):
+            values = [values]
+        if len(values) != len(types):
+            raise ValueError
+        decoded = []
+        for value, kind in zip(values, types):
+            if kind is int and type(value) is int:
+                decoded.append(value)
+            elif kind is datetime.date and isinstance(value, str):
+                decoded.append(datetime.date.fromisoformat(value))
+            else:
+                raise ValueError
+    except ValueError:
+        raise BadRequest("Cursor inválido.")
+    return decoded
+
+
+def _limit(request) -> int:
+    return max(1, _int_param(request, "limit", PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def _page(rows, limit, key, fields):
+    """Corta a página, monta o próximo cursor e remove as chaves ocultas."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(key(rows[-1])) if has_more else None
+    return [{f: row[f] for f in fields if f in row} for row in rows], next_cursor
+
+
+def _bad_request_as_json(view_func):
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except BadRequest as exc:
+            return _error(400, str(exc))
+    return _wrapped_view
+
+
+@require_GET
+@api_login_required
+@_bad_request_as_json
+def group_list_view(request):
+    """Grupos (todos, ou só os meus com ?mine=1), ordenados por id."""
+    fields = _parse_fields(request, GROUP_FIELDS, GROUP_DEFAULT_FIELDS)
+    qs = Group.objects.order_by("id")
+    if request.GET.get("mine") == "1":
+        # Subconsulta, e não JOIN, para não restringir a contagem de membros.
+        qs = qs.filter(id__in=GroupMembership.objects.filter(user=request.user).values("group_id"))
+    cursor = _decode_cursor(request, int)
+    if cursor is not None:
+        qs = qs.filter(id__gt=cursor[0])
+
+    limit = _limit(request)
+    rows = _values(qs, GROUP_FIELDS, fields, hidden=("id",), limit=limit + 1)
+    results, next_cursor = _page(rows, limit, lambda row: row["id"], fields)
+    return JsonResponse({"results": results, "next": next_cursor})
+
+
+def _attach_participations(games, fields):
+    """Uma única consulta extra para as participações de todas as partidas da página."""
+    if "participations" not in fields or not games:
+        return
+    by_game = {g["id"]: g for g in games}
+    for game in by_game.values():
+        game["participations"] = []
+    rows = _values(
+        GameParticipation.objects.filter(game_id__in=by_game).order_by("id"),
+        PARTICIPATION_FIELDS, list(PARTICIPATION_FIELDS), hidden=("game_id",),
+    )
+    for row in rows:
+        by_game[row.pop("game_id")]["participations"].append(row)
+
+
+@require_GET
+@api_login_required
+@_bad_request_as_json
+def group_games_view(request, slug):
+    """
+    Partidas do grupo, mais recentes primeiro. 'sync_cursor' é o ponto do
+    change log a partir do qual o cliente pode seguir com /changes/.
+    """
+    group, error = _member_group(request, slug)
+    if error:
+        return error
+    fields = _parse_fields(request, GAME_FIELDS, GAME_DEFAULT_FIELDS)
+    qs = Game.objects.filter(posts__group=group).order_by("-date", "-id")
+    cursor = _decode_cursor(request, datetime.date, int)
+    if cursor is not None:
+        day, last_id = cursor
+        qs = qs.filter(Q(date__lt=day) | Q(date=day, id__lt=last_id))
+
+    limit = _limit(request)
+    rows = _values(qs, GAME_FIELDS, fields, hidden=("id", "date"), limit=limit + 1)
+    results, next_cursor = _page(rows, limit, lambda row: [row["date"], row["id"]], [*fields, "id"])
+    _attach_participations(results, fields)
+    if "id" not in fields:
+        for row in results:
+            del row["id"]
+    return JsonResponse({"results": results, "next": next_cursor, "sync_cursor": group.change_seq})
+
+
+@require_GET
+@api_login_required
+@_bad_request_as_json
+def game_detail_view(request, pk):
+    """Uma partida, para o criador ou membros de um grupo em que ela foi postada."""
+    fields = _parse_fields(request, GAME_FIELDS, (*GAME_DEFAULT_FIELDS, "participations"))
+    created_by = Game.objects.filter(pk=pk).values_list("created_by_id", flat=True).first()
+    if created_by is None:
+        return _error(404, "Partida não encontrada.")
+    if created_by != request.user.pk and not GroupMembership.objects.filter(
+        user=request.user, group__posts__game_id=pk, group__hidden_at__isnull=True,
+    ).exists():
+        return _error(403, "Você não é membro de nenhum grupo desta partida.")
+    rows = _values(Game.objects.filter(pk=pk), GAME_FIELDS, fields, hidden=("id",))
+    game = rows[0]
+    _attach_participations([game], fields)
+    return JsonResponse({f: game[f] for f in fields})
+
+
+@require_GET
+@api_login_required
+@_bad_request_as_json
+def group_standings_view(request, slug):
+    """Ranking a partir dos rollups mensais (?period=month|season|all)."""
+    group, error = _member_group(request, slug)
+    if error:
+        return error
+    fields = _parse_fields(request, dict.fromkeys(STANDING_FIELDS), STANDING_FIELDS)
+    period = request.GET.get("period", "all")
+    if period not in rollups.PERIODS:
+        raise BadRequest(f"Período inválido: {period}.")
+    start, end = rollups.period_bounds(period)
+    results = [
+        {f: row["player__username"] if f == "player" else row[f] for f in fields}
+        for row in rollups.standings(group.pk, start, end)
+    ]
+    return JsonResponse({"period": period, "results": results})
+
+
+@require_GET
+@api_login_required
+@_bad_request_as_json
+def my_results_view(request):
+    """
+    Meus resultados em todos os grupos, mais recentes primeiro, uma linha por
+    partida mesmo quando ela foi postada em vários grupos (exportação).
+    Partidas arquivadas (core/archive.py) entram só nos totais.
+    """
+    fields = _parse_fields(request, RESULT_FIELDS, RESULT_FIELDS)
+    qs = crossgroup.results(request.user.pk)
+    cursor = _decode_cursor(request, datetime.date, int)
+    if cursor is not None:
+        day, last_id = cursor
+        qs = qs.filter(Q(game__date__lt=day) | Q(game__date=day, game_id__lt=last_id))
+
+    limit = _limit(request)
+    rows = _values(qs, RESULT_FIELDS, fields, hidden=("game_id", "date"), limit=limit + 1)
+    if "net" in fields:
+        for row in rows:
+            row["net"] = crossgroup.money(row["net"])
+    results, next_cursor = _page(rows, limit, lambda row: [row["date"], row["game_id"]], fields)
+    return JsonResponse({"results": results, "next": next_cursor})
+
+
+@require_GET
+@api_login_required
+@_bad_request_as_json
+def my_totals_view(request):
+    """Meus totais em todos os grupos (?period=month|season|all), sem contar partidas repetidas."""
+    period = request.GET.get("period", "all")
+    if period not in rollups.PERIODS:
+        raise BadRequest(f"Período inválido: {period}.")
+    start, end = rollups.period_bounds(period)
+    return JsonResponse({"period": period, **crossgroup.totals(request.user.pk, start, end)})
@@ -0,0 +1,122 @@
+"""
+Arquivamento de partidas antigas.
+
+Partidas anteriores a um corte (sempre 1º de janeiro) saem de Game,
+GamePost e GameParticipation e vão para ArchivedGame/ArchivedParticipation,
+que ninguém consulta a não ser a página da própria partida (e o seu
+histórico, cujas AuditEntry passam a apontar para a ArchivedGame). Os rollups
+mensais desses meses são somados em PlayerYearlyStat na mesma transação,
+então os rankings não mudam. Para os clientes de sincronização e os
+fragmentos em cache, a saída é uma remoção: cada grupo recebe no change log
+os DELETEs das partidas, postagens e participações, como no cascade de um
+delete comum. Cada mês é arquivado na sua própria transação.
+
+Os ratings guardam o histórico já calculado e não são reprocessados antes do
+último ano arquivado (ver ratings.replay_from); as estatísticas de dispersão
+(core/stats.py) passam a cobrir só as partidas que continuam nas tabelas.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import TruncMonth
+
+from . import changelog, signals
+from .models import (
+    ArchivedGame, ArchivedParticipation, AuditEntry, ChangeLogEntry, Game, GameParticipation, GamePost,
+    PlayerMonthlyStat, PlayerYearlyStat,
+)
+from .rollups import next_month
+
+STAT_FIELDS = ("games", "wins", "invested", "final_total", "rebuy", "net")
+
+
+def cutoff(keep_years: int, today: datetime.date) -> datetime.date:
+    """Primeiro dia mantido: 1º de janeiro, 'keep_years' anos antes do ano corrente."""
+    return datetime.date(today.year - keep_years, 1, 1)
+
+
+def pending_months(before: datetime.date) -> list[datetime.date]:
+    """Meses anteriores ao corte com partidas ou rollups ainda nas tabelas principais."""
+    months = set(
+        Game.objects.filter(date__lt=before)
+        .annotate(month=TruncMonth("date")).values_list("month", flat=True).distinct()
+    )
+    months.update(PlayerMonthlyStat.objects.filter(month__lt=before).values_list("month", flat=True).distinct())
+    return sorted(months)
+
+
+def _fold_rollups(month: datetime.date) -> None:
+    """Soma os rollups do mês às linhas anuais e remove os mensais."""
+    monthly = list(PlayerMonthlyStat.objects.filter(month=month))
+    if not monthly:
+        return
+    existing = {
+        (s.group_id, s.player_id): s
+        for s in PlayerYearlyStat.objects.filter(year=month.year, group_id__in={m.group_id for m in monthly})
+    }
+    to_update = list(existing.values())
+    to_create = {}
+    for row in monthly:
+        key = (row.group_id, row.player_id)
+        yearly = existing.get(key) or to_create.get(key)
+        if yearly is None:
+            yearly = to_create[key] = PlayerYearlyStat(group_id=row.group_id, player_id=row.player_id, year=month.year)
+        for field in STAT_FIELDS:
+            setattr(yearly, field, getattr(yearly, field) + getattr(row, field))
+
+    PlayerYearlyStat.objects.bulk_update(to_update, STAT_FIELDS, batch_size=500)
+    PlayerYearlyStat.objects.bulk_create(to_create.values(), batch_size=500)
+    PlayerMonthlyStat.objects.filter(month=month).delete()
+
+
+@transaction.atomic
+def archive_month(month: datetime.date) -> tuple[int, int]:
+    """Arquiva as partidas de um mês. Retorna (partidas, participações)."""
+    games = list(Game.objects.filter(date__gte=month, date__lt=next_month(month)))
+    game_ids = [g.pk for g in games]
+    posts = list(GamePost.objects.filter(game_id__in=game_ids))
+    group_ids = {}
+    for post in posts:
+        group_ids.setdefault(post.game_id, []).append(post.group_id)
+    participations = list(GameParticipation.objects.filter(game_id__in=game_ids))
+
+    ArchivedGame.objects.bulk_create([
+        ArchivedGame(
+            id=g.pk, title=g.title, date=g.date, location=g.location, buy_in=g.buy_in,
+            created_by_id=g.created_by_id, created_at=g.created_at, group_ids=sorted(group_ids.get(g.pk, [])),
+        )
+        for g in games
+    ], batch_size=500)
+    ArchivedParticipation.objects.bulk_create([
+        ArchivedParticipation(
+            game_id=p.game_id, player_id=p.player_id, rebuy=p.rebuy,
+            final_balance=p.final_balance, created_at=p.created_at,
+        )
+        for p in participations
+    ], batch_size=500)
+
+    AuditEntry.objects.filter(game_id__in=game_ids).update(archived_game_id=F("game_id"), game=None)
+    _fold_rollups(month)
+    _log_deletes(games, posts, participations)
+    # Os rollups já foram movidos, o change log já foi gravado e o histórico
+    # de ratings fica como está.
+    with signals.suspended():
+        Game.all_objects.filter(pk__in=game_ids).delete()
+    return len(games), len(participations)
+
+
+def _log_deletes(games, posts, participations) -> None:
+    """DELETEs no change log de cada grupo, na ordem do cascade: participações, postagens, partidas."""
+    by_game = {}
+    for p in participations:
+        by_game.setdefault(p.game_id, []).append(p)
+    by_pk = {g.pk: g for g in games}
+    by_group = {}
+    for post in posts:
+        by_group.setdefault(post.group_id, []).append(post)
+    for group_id, group_posts in by_group.items():
+        instances = [p for post in group_posts for p in by_game.get(post.game_id, [])]
+        instances += group_posts
+        instances += [by_pk[post.game_id] for post in group_posts]
+        changelog.record_many(group_id, instances, ChangeLogEntry.Op.DELETE)
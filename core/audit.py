@@ -0,0 +1,177 @@
+"""
+Histórico de alterações de partidas e participações (AuditEntry).
+
+Os receivers em core/signals.py chamam record() depois de cada save/delete;
+o diff sai de '_loaded_values' (LoadedValuesMixin), sem reler a linha, e o
+autor vem do AuditActorMiddleware via contextvar. Fora de uma requisição
+(comandos, workers) o autor fica vazio.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from itertools import groupby
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AuditEntry, Game, GameParticipation
+
+# Campos que entram no histórico; o resto (ids, created_at, hidden_at) não é disputado.
+TRACKED = {
+    Game: ("title", "date", "location", "buy_in"),
+    GameParticipation: ("player_id", "rebuy", "final_balance"),
+}
+MODEL_NAMES = {Game: "game", GameParticipation: "participation"}
+LABELS = {
+    "title": "Nome",
+    "date": "Data",
+    "location": "Local",
+    "buy_in": "Buy-in",
+    "player": "Jogador",
+    "rebuy": "Rebuy",
+    "final_balance": "Stack final",
+}
+PAGE_SIZE = 50
+
+_actor = ContextVar("audit_actor", default=None)
+_encoder = DjangoJSONEncoder()
+
+
+@contextmanager
+def acting_as(user):
+    """
+    Atribui as alterações feitas no bloco a 'user', ou ao usuário devolvido
+    por 'user()' quando for uma função (resolvido só se houver o que gravar).
+    """
+    token = _actor.set(user)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+def _actor_id():
+    user = _actor.get()
+    if callable(user):
+        user = user()
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+
+def _value(field, value):
+    # Decimal e date viram texto; valores em dinheiro sempre com as casas do campo.
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Decimal):
+        return f"{value:.{field.decimal_places}f}"
+    return _encoder.default(value)
+
+
+def diff(instance, action) -> dict:
+    """{campo: [antigo, novo]} dos campos rastreados que mudaram."""
+    changes = {}
+    for attname in TRACKED[type(instance)]:
+        new = getattr(instance, attname)
+        if action == AuditEntry.Action.CREATE:
+            old = None
+        elif action == AuditEntry.Action.DELETE:
+            old, new = new, None
+        else:
+            old = instance.loaded_value(attname)
+        if old != new:
+            field = instance._meta.get_field(attname)
+            changes[field.name] = [_value(field, old), _value(field, new)]
+    return changes
+
+
+def record(instance, action, game_deleted: bool = False) -> AuditEntry | None:
+    """
+    Acrescenta uma entrada ao histórico; saves sem mudança não geram nada.
+    'game_deleted': a linha da partida já foi apagada, então a entrada fica
+    sem 'game' e é encontrada por model/object_id, como as anteriores
+    (AuditEntry.game é SET_NULL).
+    """
+    changes = diff(instance, action)
+    if not changes:
+        return None
+    return AuditEntry.objects.create(
+        game_id=None if game_deleted else instance.pk if isinstance(instance, Game) else instance.game_id,
+        model=MODEL_NAMES[type(instance)],
+        object_id=instance.pk,
+        action=action,
+        actor_id=_actor_id(),
+        changes=changes,
+    )
+
+
+def timeline(game_id: int, before: int | None = None, size: int = PAGE_SIZE, archived: bool = False):
+    """
+    Uma página do histórico da partida (mais recentes primeiro), paginada pelo
+    id; 'archived' para uma partida já movida para ArchivedGame.
+    """
+    qs = AuditEntry.objects.filter(**{"archived_game_id" if archived else "game_id": game_id})
+    if before:
+        qs = qs.filter(id__lt=before)
+    return list(qs.select_related("actor").order_by("-id")[:size])
+
+
+def describe(entries) -> None:
+    """Preenche entry.rows com (rótulo, antigo, novo), com os nomes dos jogadores em uma consulta."""
+    player_ids = {value for entry in entries for value in entry.changes.get("player", ()) if value}
+    players = dict(get_user_model().objects.filter(pk__in=player_ids).values_list("id", "username"))
+    for entry in entries:
+        entry.rows = []
+        for field, (old, new) in entry.changes.items():
+            if field == "player":
+                old, new = players.get(old, old), players.get(new, new)
+            entry.rows.append((LABELS.get(field, field), old, new))
+
+
+def _merge(run):
+    """Uma sequência de UPDATEs do mesmo objeto vira um só: primeiro antigo, último novo."""
+    merged = {}
+    for entry in run:
+        for field, (old, new) in entry.changes.items():
+            merged[field] = [merged[field][0] if field in merged else old, new]
+    return {field: values for field, values in merged.items() if values[0] != values[1]}
+
+
+@transaction.atomic
+def compact(older_than, drop_older_than=None) -> tuple[int, int]:
+    """
+    Junta os UPDATEs consecutivos de cada objeto anteriores a 'older_than' na
+    última entrada da sequência (que guarda o autor e a data finais) e, se
+    pedido, apaga tudo que for anterior a 'drop_older_than'.
+    Retorna (entradas fundidas, entradas apagadas).
+    """
+    now = timezone.now()
+    dropped = 0
+    if drop_older_than is not None:
+        dropped, _ = AuditEntry.objects.filter(created_at__lt=now - drop_older_than).delete()
+
+    entries = (
+        AuditEntry.objects.filter(created_at__lt=now - older_than)
+        .only("id", "model", "object_id", "action", "changes")
+        .order_by("model", "object_id", "id")
+    )
+    to_update, to_delete = [], []
+    for _, history in groupby(entries.iterator(), key=lambda e: (e.model, e.object_id)):
+        for is_update, run in groupby(history, key=lambda e: e.action == AuditEntry.Action.UPDATE):
+            run = list(run)
+            if not is_update or len(run) < 2:
+                continue
+            last = run[-1]
+            last.changes = _merge(run)
+            to_delete += [e.pk for e in run[:-1]]
+            if last.changes:
+                to_update.append(last)
+            else:
+                to_delete.append(last.pk)  # voltou ao valor original
+
+    AuditEntry.objects.bulk_update(to_update, ["changes"], batch_size=500)
+    for start in range(0, len(to_delete), 500):
+        AuditEntry.objects.filter(pk__in=to_delete[start:start + 500]).delete()
+    return len(to_delete), dropped
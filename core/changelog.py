@@ -0,0 +1,91 @@
+"""
+Change log por grupo para a API de sincronização incremental.
+
+Cada inserção, alteração ou remoção de Game, GamePost, GameParticipation e
+GroupMembership vira uma ChangeLogEntry em cada grupo afetado, com um número
+de sequência monotônico alocado a partir de Group.change_seq.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from .models import ChangeLogEntry, GamePost, GameParticipation, Group, GroupMembership
+
+MODEL_NAMES = {
+    "Game": "game",
+    "GamePost": "gamepost",
+    "GameParticipation": "participation",
+    "GroupMembership": "membership",
+}
+
+
+def serialize(instance) -> dict:
+    """Campos concretos da instância (ids no lugar de objetos relacionados)."""
+    return {f.attname: getattr(instance, f.attname) for f in instance._meta.concrete_fields}
+
+
+def groups_for(instance) -> list[int]:
+    """Grupos em que uma alteração da instância deve aparecer."""
+    if isinstance(instance, (GamePost, GroupMembership)):
+        return [instance.group_id]
+    game_id = instance.game_id if isinstance(instance, GameParticipation) else instance.pk
+    return list(GamePost.objects.filter(game_id=game_id).values_list("group_id", flat=True))
+
+
+@transaction.atomic
+def record(group_ids, instance, op, *, data=None) -> None:
+    """Acrescenta uma entrada ao log de cada grupo, alocando a próxima sequência."""
+    group_ids = list(set(group_ids))
+    if not group_ids:
+        return
+    if data is None and op != ChangeLogEntry.Op.DELETE:
+        data = serialize(instance)
+
+    Group.objects.filter(pk__in=group_ids).update(change_seq=F("change_seq") + 1)
+    seqs = Group.objects.filter(pk__in=group_ids).values_list("id", "change_seq")
+    ChangeLogEntry.objects.bulk_create([
+        ChangeLogEntry(
+            group_id=group_id,
+            seq=seq,
+            model=MODEL_NAMES[type(instance).__name__],
+            object_id=instance.pk,
+            op=op,
+            data=data,
+        )
+        for group_id, seq in seqs
+    ])
+
+
+@transaction.atomic
+def record_many(group_id: int, instances, op) -> None:
+    """
+    Registra várias instâncias de uma vez no log de um grupo (para escritas em
+    lote, que não disparam sinais): uma única alocação de sequência.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    Group.objects.filter(pk=group_id).update(change_seq=F("change_seq") + len(instances))
+    last = Group.objects.filter(pk=group_id).values_list("change_seq", flat=True).get()
+    first = last - len(instances) + 1
+    ChangeLogEntry.objects.bulk_create([
+        ChangeLogEntry(
+            group_id=group_id,
+            seq=first + i,
+            model=MODEL_NAMES[type(instance).__name__],
+            object_id=instance.pk,
+            op=op,
+            data=None if op == ChangeLogEntry.Op.DELETE else serialize(instance),
+        )
+        for i, instance in enumerate(instances)
+    ])
+
+
+def changes_since(group_id: int, cursor: int, limit: int):
+    """Até 'limit' entradas depois de 'cursor', e se ainda há mais."""
+    rows = list(
+        ChangeLogEntry.objects
+        .filter(group_id=group_id, seq__gt=cursor)
+        .order_by("seq")
+        .values("seq", "model", "object_id", "op", "data", "created_at")[:limit + 1]
+    )
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,81 @@
+"""
+Estatísticas que cruzam grupos ("todos os meus grupos").
+
+Uma partida postada em vários grupos tem um GamePost por grupo: somar os
+rollups de cada grupo, ou juntar GamePost com as participações, conta a
+mesma partida mais de uma vez. Aqui o conjunto de partidas de um jogador sai
+direto de GameParticipation pelo índice (player, game), em que cada partida
+aparece uma única vez (unique game+player), sem DISTINCT sobre JOINs.
+Totais de período longo somam também as participações arquivadas.
+"""
+import datetime
+from decimal import Decimal
+
+from django.db import models
+from django.db.models import Count, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import ArchivedParticipation, Game, GameParticipation, GamePost, GroupMembership
+
+_MONEY = models.DecimalField(max_digits=14, decimal_places=2)
+_REBUY = Coalesce("rebuy", Value(Decimal("0")), output_field=_MONEY)
+_INVESTED = ExpressionWrapper(F("game__buy_in") + _REBUY, output_field=_MONEY)
+NET = ExpressionWrapper(F("final_balance") - _INVESTED, output_field=_MONEY)
+CENTS = Decimal("0.01")
+MONEY_FIELDS = ("invested", "final_total", "rebuy", "net")
+
+
+def money(value: Decimal) -> Decimal:
+    """Duas casas, como as colunas: somas e contas no SQLite voltam sem escala ('20')."""
+    return value.quantize(CENTS)
+
+
+def _in_period(qs, start: datetime.date | None, end: datetime.date | None):
+    if start:
+        qs = qs.filter(game__date__gte=start)
+    if end:
+        qs = qs.filter(game__date__lt=end)
+    return qs
+
+
+def participations(user_id: int, start: datetime.date | None = None, end: datetime.date | None = None):
+    """Resultados do jogador no intervalo [start, end), um por partida."""
+    qs = GameParticipation.objects.filter(player_id=user_id, game__hidden_at__isnull=True)
+    return _in_period(qs, start, end)
+
+
+def _aggregate(qs) -> dict:
+    row = qs.aggregate(
+        games=Count("id"),
+        wins=Count("id", filter=Q(final_balance__gt=_INVESTED)),
+        invested=Coalesce(Sum(_INVESTED), Value(Decimal("0")), output_field=_MONEY),
+        final_total=Coalesce(Sum("final_balance"), Value(Decimal("0")), output_field=_MONEY),
+        rebuy=Coalesce(Sum(_REBUY), Value(Decimal("0")), output_field=_MONEY),
+    )
+    row["net"] = row["final_total"] - row["invested"]
+    return row
+
+
+def totals(user_id: int, start: datetime.date | None = None, end: datetime.date | None = None) -> dict:
+    """
+    Totais do jogador em todos os grupos no intervalo [start, end): cada
+    partida conta uma vez, esteja ela em um ou em vários grupos.
+    """
+    result = _aggregate(participations(user_id, start, end))
+    archived = _in_period(ArchivedParticipation.objects.filter(player_id=user_id), start, end)
+    for field, value in _aggregate(archived).items():
+        result[field] += value
+    for field in MONEY_FIELDS:
+        result[field] = money(result[field])
+    return result
+
+
+def member_games(user_id: int):
+    """Partidas postadas em qualquer grupo visível do usuário, uma linha por partida."""
+    group_ids = GroupMembership.objects.filter(user_id=user_id, group__hidden_at__isnull=True).values("group_id")
+    return Game.objects.filter(id__in=GamePost.objects.filter(group_id__in=group_ids).values("game_id"))
+
+
+def results(user_id: int):
+    """Resultados do jogador para exportação, mais recentes primeiro (saldo em NET)."""
+    return participations(user_id).order_by("-game__date", "-game_id")
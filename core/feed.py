@@ -0,0 +1,66 @@
+"""
+Feed de atividades com fan-out na escrita.
+
+Cada evento vira uma linha por destinatário em FeedEntry; ler o feed é uma
+única varredura no índice (user, -id). Cada usuário guarda no máximo
+MAX_ENTRIES itens: os mais antigos são podados na própria escrita.
+"""
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import FeedEntry, GroupMembership
+
+MAX_ENTRIES = 200
+PAGE_SIZE = 30
+
+
+def _pk(obj):
+    return getattr(obj, "pk", obj)
+
+
+def publish(kind, user_ids, *, actor=None, group=None, game=None) -> int:
+    """
+    Grava o evento no feed de cada destinatário e poda o excedente.
+    actor, group e game aceitam instâncias ou ids.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return 0
+    FeedEntry.objects.bulk_create([
+        FeedEntry(user_id=uid, kind=kind, actor_id=_pk(actor), group_id=_pk(group), game_id=_pk(game))
+        for uid in user_ids
+    ])
+    prune(user_ids)
+    return len(user_ids)
+
+
+def publish_to_group(kind, group, *, actor=None, game=None) -> int:
+    """Fan-out para todos os membros do grupo, exceto quem gerou o evento."""
+    members = GroupMembership.objects.filter(group_id=_pk(group)).values_list("user_id", flat=True)
+    if actor is not None:
+        members = members.exclude(user_id=_pk(actor))
+    return publish(kind, members, actor=actor, group=group, game=game)
+
+
+def prune(user_ids=None, keep: int = MAX_ENTRIES) -> int:
+    """Apaga o que passar de 'keep' itens por usuário."""
+    qs = FeedEntry.objects.all()
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+    excess = list(
+        qs.annotate(position=Window(RowNumber(), partition_by=F("user_id"), order_by=F("id").desc()))
+        .filter(position__gt=keep)
+        .values_list("id", flat=True)
+    )
+    if not excess:
+        return 0
+    deleted, _ = FeedEntry.objects.filter(pk__in=excess).delete()
+    return deleted
+
+
+def page(user, before: int | None = None, size: int = PAGE_SIZE):
+    """Uma página do feed (mais recentes primeiro), paginada pelo id."""
+    qs = FeedEntry.objects.filter(user=user)
+    if before:
+        qs = qs.filter(id__lt=before)
+    return list(qs.select_related("actor", "group", "game").order_by("-id")[:size])
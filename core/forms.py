@@ -11,11 +11,12 @@ User = get_user_model()
 class GroupForm(forms.ModelForm):
     class Meta:
         model = Group
-        fields = ["name", "description"]
-        labels = {"name": "Nome", "description": "Descrição"}
+        fields = ["name", "description", "image"]
+        labels = {"name": "Nome", "description": "Descrição", "image": "Foto"}
         widgets = {
             "name": forms.TextInput(attrs={"class": "form-control", "autocomplete": "off"}),
             "description": forms.Textarea(attrs={"class": "text-light form-control", "rows": 4}),
+            "image": forms.ClearableFileInput(attrs={"class": "form-control", "accept": "image/*"}),
         }
 
     def clean_name(self):
@@ -27,8 +28,21 @@ class GroupForm(forms.ModelForm):
     def clean(self):
         cleaned = super().clean()
         name = cleaned.get("name")
-        if name and Group.objects.annotate(n=Lower("name")).filter(n=name.lower()).exists():
+        if not name:
+            return cleaned
+        # all_objects: um grupo escondido, ainda na fila do purge, continua
+        # com o nome no banco (e o unique do ModelForm só olha os visíveis).
+        clash = (
+            Group.all_objects.annotate(n=Lower("name")).filter(n=name.lower())
+            .exclude(pk=self.instance.pk).only("hidden_at").first()
+        )
+        if clash is None:
+            return cleaned
+        if clash.hidden_at is None:
             self.add_error("name", "Já existe um grupo com este nome.")
+        else:
+            self.add_error("name", "Este nome é de um grupo que ainda está sendo removido. Tente de novo em alguns minutos.")
+        return cleaned
 
 class GameForm(forms.ModelForm):
     groups = forms.ModelMultipleChoiceField(
@@ -0,0 +1,98 @@
+"""
+POSTs idempotentes.
+
+Cada formulário leva uma chave gerada na renderização (campo oculto
+'idempotency_key'; clientes de API podem usar o cabeçalho Idempotency-Key).
+A view roda numa transação junto com o registro da chave: se o cliente
+reenviar depois de um timeout, recebe o mesmo redirect da primeira vez em
+vez de criar uma segunda partida. Uma tentativa concorrente com a mesma
+chave esbarra na unicidade (user, key) e também recebe a resposta original.
+"""
+import hashlib
+import uuid
+from datetime import timedelta
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+FIELD = "idempotency_key"
+TTL = timedelta(hours=24)
+_IGNORED = {"csrfmiddlewaretoken", FIELD}
+
+
+def _fingerprint(request) -> str:
+    """Hash do caminho e do corpo: a mesma chave não pode valer para outro pedido."""
+    digest = hashlib.sha256(request.path.encode())
+    for name, values in sorted(request.POST.lists()):
+        if name not in _IGNORED:
+            digest.update(f"\0{name}={values!r}".encode())
+    return digest.hexdigest()
+
+
+def _replay(entry, fingerprint):
+    if entry.request_hash != fingerprint:
+        return HttpResponse("Chave de idempotência já usada em outra requisição.", status=422)
+    response = HttpResponse(status=entry.status_code)
+    if entry.location:
+        response["Location"] = entry.location
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view_func):
+    """
+    Roda o POST numa transação; com chave, grava a chave junto e
+    repete a resposta original nas tentativas seguintes. Só redirects (o
+    sucesso dos formulários) são guardados: um formulário com erro desfaz a
+    transação e a mesma chave pode ser reenviada já corrigida.
+    Deve ficar abaixo do @login_required.
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        key = ""
+        if request.method == "POST":
+            key = (request.headers.get(HEADER) or request.POST.get(FIELD, "")).strip()[:64]
+        # Usada pelo template para o campo oculto do próximo envio.
+        request.idempotency_key = key or uuid.uuid4().hex
+        if request.method != "POST":
+            # Só leitura: sem transação, que no SQLite já pegaria o lock de
+            # escrita (transaction_mode IMMEDIATE, ver settings).
+            return view_func(request, *args, **kwargs)
+        if not key:
+            with transaction.atomic():
+                return view_func(request, *args, **kwargs)
+
+        fingerprint = _fingerprint(request)
+        entry = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if entry is not None:
+            return _replay(entry, fingerprint)
+        try:
+            with transaction.atomic():
+                response = view_func(request, *args, **kwargs)
+                if 300 <= response.status_code < 400:
+                    IdempotencyKey.objects.create(
+                        user=request.user, key=key, request_hash=fingerprint,
+                        status_code=response.status_code, location=response.get("Location", ""),
+                    )
+                else:
+                    transaction.set_rollback(True)
+                return response
+        except IntegrityError:
+            # Outra tentativa com a mesma chave terminou primeiro.
+            entry = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+            if entry is None:
+                raise
+            return _replay(entry, fingerprint)
+
+    return _wrapped_view
+
+
+def prune(older_than: timedelta = TTL) -> int:
+    """Remove chaves antigas; depois do TTL um reenvio grava de novo."""
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - older_than).delete()
+    return deleted
@@ -0,0 +1,132 @@
+"""
+Modo ao vivo das partidas: pub/sub em processo para as views assíncronas.
+
+Cada alteração de participação gera um único snapshot da partida, publicado
+uma vez; os espectadores conectados (SSE ou long-poll) apenas são acordados
+e leem esse mesmo snapshot. O registro vive no processo, então com vários
+workers cada um atende os seus próprios espectadores.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from .models import Game, GameParticipation
+
+KEEPALIVE_SECONDS = 15
+LONG_POLL_SECONDS = 25
+
+_lock = threading.Lock()
+_watchers: dict[int, set] = defaultdict(set)
+_versions: dict[int, int] = defaultdict(int)
+_latest: dict[int, dict] = {}
+
+
+class _Watcher:
+    """Um espectador: acordado pelo publish a partir de qualquer thread."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.event = asyncio.Event()
+
+    def notify(self):
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            pass  # loop já encerrado; o watch() limpa o registro
+
+
+def current_version(game_id: int) -> int:
+    # .get: uma leitura não deve criar uma entrada para cada partida aberta.
+    return _versions.get(game_id, 0)
+
+
+def has_watchers(game_id: int) -> bool:
+    return bool(_watchers.get(game_id))
+
+
+def snapshot(game_id: int) -> dict | None:
+    """Estado atual da partida, serializável em JSON."""
+    game = Game.objects.only("id", "buy_in").filter(pk=game_id).first()
+    if game is None:
+        return None
+    rows = list(
+        GameParticipation.objects
+        .filter(game_id=game_id)
+        .order_by("id")
+        .values("id", "player__username", "final_balance", "rebuy")
+    )
+    buy_in = game.buy_in or 0
+    return {
+        "game": game_id,
+        "buy_in": str(buy_in),
+        "total_pot": str(sum(buy_in + (r["rebuy"] or 0) for r in rows)),
+        "participations": [
+            {
+                "id": r["id"],
+                "player": r["player__username"],
+                "final_balance": str(r["final_balance"]),
+                "rebuy": str(r["rebuy"] or 0),
+            }
+            for r in rows
+        ],
+    }
+
+
+def publish(game_id: int, payload: dict) -> dict:
+    with _lock:
+        _versions[game_id] += 1
+        message = {**payload, "version": _versions[game_id]}
+        _latest[game_id] = message
+        watchers = list(_watchers.get(game_id, ()))
+    for watcher in watchers:
+        watcher.notify()
+    return message
+
+
+def publish_game(game_id: int) -> dict | None:
+    """Publica o snapshot da partida, se houver alguém assistindo."""
+    if not has_watchers(game_id):
+        return None
+    payload = snapshot(game_id)
+    return publish(game_id, payload) if payload else None
+
+
+class watch:
+    """
+    'async with watch(game_id) as watcher': registra o espectador enquanto
+    durar o bloco. A limpeza é síncrona para funcionar mesmo quando o
+    gerador da resposta é finalizado fora do loop.
+    """
+
+    def __init__(self, game_id: int):
+        self.game_id = game_id
+
+    async def __aenter__(self) -> _Watcher:
+        self.watcher = _Watcher()
+        with _lock:
+            _watchers[self.game_id].add(self.watcher)
+        return self.watcher
+
+    async def __aexit__(self, *exc_info):
+        with _lock:
+            watchers = _watchers.get(self.game_id)
+            if watchers is not None:
+                watchers.discard(self.watcher)
+                if not watchers:
+                    del _watchers[self.game_id]
+                    _latest.pop(self.game_id, None)
+        return False
+
+
+async def next_message(watcher: _Watcher, game_id: int, since: int, timeout: float) -> dict | None:
+    """Próxima mensagem com versão maior que 'since', ou None após 'timeout'."""
+    watcher.event.clear()
+    message = _latest.get(game_id)
+    if message and message["version"] > since:
+        return message
+    try:
+        await asyncio.wait_for(watcher.event.wait(), timeout)
+    except asyncio.TimeoutError:
+        return None
+    message = _latest.get(game_id)
+    return message if message and message["version"] > since else None
@@ -0,0 +1,46 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move as partidas anteriores ao corte para as tabelas de arquivo, mês a mês, "
+        "somando os rollups desses meses em totais anuais (PlayerYearlyStat)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep-years", type=int, default=2,
+                            help="Anos completos mantidos além do corrente (padrão: 2).")
+        parser.add_argument("--before-year", type=int,
+                            help="Arquiva tudo antes de 1º de janeiro deste ano (ignora --keep-years).")
+        parser.add_argument("--dry-run", action="store_true", help="Só lista os meses que seriam arquivados.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        if options["before_year"]:
+            before = datetime.date(options["before_year"], 1, 1)
+        else:
+            before = archive.cutoff(options["keep_years"], today)
+        if before > today.replace(month=1, day=1):
+            raise CommandError("O ano corrente não pode ser arquivado.")
+
+        months = archive.pending_months(before)
+        self.stdout.write(f"Corte: {before:%d/%m/%Y} — {len(months)} meses a arquivar.")
+        if options["dry_run"]:
+            for month in months:
+                self.stdout.write(f"  {month:%m/%Y}")
+            return
+
+        games = participations = 0
+        for month in months:
+            g, p = archive.archive_month(month)
+            games += g
+            participations += p
+            self.stdout.write(f"  {month:%m/%Y}: {g} partidas, {p} participações")
+        self.stdout.write(self.style.SUCCESS(
+            f"{games} partidas e {participations} participações arquivadas."
+        ))
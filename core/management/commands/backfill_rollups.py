@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import rollups
+from core.models import Group
+
+
+class Command(BaseCommand):
+    help = "Reconstrói os rollups mensais (PlayerMonthlyStat) a partir das participações existentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", dest="slug", help="Slug de um grupo específico (padrão: todos).")
+
+    def handle(self, *args, **options):
+        groups = Group.objects.all()
+        if options["slug"]:
+            groups = groups.filter(slug=options["slug"])
+            if not groups.exists():
+                raise CommandError(f"Grupo '{options['slug']}' não encontrado.")
+
+        total = 0
+        for group in groups.only("id", "name"):
+            count = rollups.rebuild_group(group.pk)
+            total += count
+            self.stdout.write(f"{group.name}: {count} linhas")
+        self.stdout.write(self.style.SUCCESS(f"Rollups reconstruídos: {total} linhas."))
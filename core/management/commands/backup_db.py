@@ -0,0 +1,99 @@
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Faz um snapshot consistente do banco SQLite com a API de backup online, "
+        "em passos de N páginas, sem bloquear as escritas do servidor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dest", default=str(Path(settings.BASE_DIR) / "backups"),
+                            help="Diretório dos snapshots (padrão: <BASE_DIR>/backups).")
+        parser.add_argument("--pages", type=int, default=256, help="Páginas copiadas por passo (padrão: 256).")
+        parser.add_argument("--pause", type=float, default=0.02,
+                            help="Segundos de espera entre passos, para os writers avançarem (padrão: 0.02).")
+        parser.add_argument("--gzip", action="store_true", help="Comprime o snapshot (.gz).")
+        parser.add_argument("--keep", type=int, default=7, help="Quantos snapshots manter (padrão: 7; 0 = todos).")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if connection.vendor != "sqlite":
+            raise CommandError("backup_db só funciona com SQLite.")
+        source_path = Path(connection.settings_dict["NAME"])
+        if not source_path.exists():
+            raise CommandError(f"Banco não encontrado: {source_path}")
+
+        dest = Path(options["dest"])
+        dest.mkdir(parents=True, exist_ok=True)
+        stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+        target = dest / f"{source_path.stem}-{stamp}.sqlite3"
+        partial = target.with_name(target.name + ".part")
+
+        started = time.perf_counter()
+        self._backup(source_path, partial, options["pages"], options["pause"], options["verbosity"])
+        self._verify(partial)
+
+        if options["gzip"]:
+            with open(partial, "rb") as raw, gzip.open(target.with_name(target.name + ".gz.part"), "wb") as packed:
+                shutil.copyfileobj(raw, packed, length=1024 * 1024)
+            partial.unlink()
+            partial = target.with_name(target.name + ".gz.part")
+            target = target.with_name(target.name + ".gz")
+        # Só aparece com o nome final depois de verificado e completo.
+        os.replace(partial, target)
+
+        elapsed = time.perf_counter() - started
+        size_mb = target.stat().st_size / 1024 / 1024
+        self.stdout.write(self.style.SUCCESS(f"Snapshot {target} ({size_mb:.1f} MB) em {elapsed:.2f}s"))
+
+        if options["keep"] > 0:
+            self._rotate(dest, source_path.stem, options["keep"])
+
+    def _backup(self, source_path, target_path, pages, pause, verbosity):
+        # Conexão própria e só leitura: a do Django pode estar dentro de uma transação.
+        source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+        target = sqlite3.connect(target_path)
+
+        def progress(status, remaining, total):
+            if verbosity > 1:
+                self.stdout.write(f"  {total - remaining}/{total} páginas")
+            # Entre passos o lock de leitura é solto; dá vez aos writers.
+            time.sleep(pause)
+
+        try:
+            source.backup(target, pages=max(1, pages), progress=progress)
+        finally:
+            target.close()
+            source.close()
+
+    def _verify(self, path):
+        snapshot = sqlite3.connect(path)
+        try:
+            result = [row[0] for row in snapshot.execute("PRAGMA integrity_check")]
+        finally:
+            snapshot.close()
+        if result != ["ok"]:
+            path.unlink(missing_ok=True)
+            raise CommandError("integrity_check falhou no snapshot: " + "; ".join(result[:5]))
+
+    def _rotate(self, dest, stem, keep):
+        snapshots = sorted(
+            [p for p in dest.glob(f"{stem}-*.sqlite3*") if not p.name.endswith(".part")],
+            key=lambda p: p.name,
+            reverse=True,
+        )
+        for old in snapshots[keep:]:
+            old.unlink()
+            self.stdout.write(f"Removido {old.name}")
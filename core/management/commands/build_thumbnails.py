@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core import thumbnails
+from core.models import Group
+
+
+class Command(BaseCommand):
+    help = "Gera as miniaturas pendentes das fotos de grupo (ou todas, com --force)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Refaz mesmo as miniaturas já atualizadas.")
+
+    def handle(self, *args, **options):
+        built = 0
+        for group in Group.objects.only("id", "name", "image", "thumbnails"):
+            if not options["force"] and thumbnails.is_current(group):
+                continue
+            try:
+                changed = thumbnails.build(group.pk, force=options["force"])
+            except Exception as exc:
+                self.stdout.write(self.style.ERROR(f"{group.name}: {exc}"))
+                continue
+            built += changed
+        self.stdout.write(self.style.SUCCESS(f"{built} grupos atualizados."))
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core import audit
+
+
+class Command(BaseCommand):
+    help = (
+        "Compacta o histórico de alterações: UPDATEs consecutivos de um mesmo objeto, "
+        "mais antigos que --days, viram uma única entrada. Com --drop-days, apaga o que "
+        "for mais antigo que isso."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=90, help="Idade mínima para compactar (padrão: 90).")
+        parser.add_argument("--drop-days", type=int, help="Apaga entradas mais antigas que isso (padrão: nunca).")
+
+    def handle(self, *args, **options):
+        drop = timedelta(days=options["drop_days"]) if options["drop_days"] is not None else None
+        merged, dropped = audit.compact(timedelta(days=options["days"]), drop)
+        self.stdout.write(self.style.SUCCESS(f"{merged} entradas fundidas, {dropped} apagadas."))
@@ -0,0 +1,53 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core import stats
+from core.models import Group
+
+
+def _init_worker():
+    # Cada processo abre a sua própria conexão com o banco.
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Calcula as estatísticas em lote (variância, sequências, ROI) de todos os grupos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Processos do pool (padrão: número de CPUs).")
+
+    def handle(self, *args, **options):
+        group_ids = list(Group.objects.values_list("id", flat=True))
+        workers = max(1, options["workers"])
+        started = time.perf_counter()
+        rows_read = 0
+
+        if workers == 1:
+            results = map(stats.compute_group, group_ids)
+            for group_id, rows, count in results:
+                stats.persist(group_id, rows)
+                rows_read += count
+        else:
+            # Conexões abertas não podem ser herdadas pelos processos filhos.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                futures = [pool.submit(stats.compute_group, gid) for gid in group_ids]
+                # Os workers só leem; a escrita fica no processo principal
+                # para não disputar o lock de escrita do SQLite.
+                for future in as_completed(futures):
+                    group_id, rows, count = future.result()
+                    stats.persist(group_id, rows)
+                    rows_read += count
+
+        elapsed = time.perf_counter() - started or 1e-9
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(group_ids)} grupos, {rows_read} participações em {elapsed:.2f}s "
+            f"({len(group_ids) / elapsed:.1f} grupos/s, {rows_read / elapsed:.0f} participações/s)"
+        ))
@@ -0,0 +1,119 @@
+import datetime
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+
+from core.models import FeedEntry, Game, GameParticipation, GamePost, Group, GroupMembership
+
+# SQLite: "SCAN tabela" sem índice é varredura completa; "USE TEMP B-TREE"
+# é uma ordenação/agrupamento montado em memória a cada execução.
+FULL_SCAN = re.compile(r"\bSCAN (\w+)\b(?! USING)")
+TEMP_BTREE = re.compile(r"USE TEMP B-TREE FOR ([\w ]+)")
+
+
+def _hot_queries(group_id, user_id, game_id):
+    """
+    (nome, queryset, índice sugerido) das consultas das views mais acessadas.
+    O índice sugerido é (modelo, campos) para o formato da consulta, ou None
+    quando nenhum índice de uma tabela só resolve (ex.: ordenação após JOIN).
+    """
+    today = datetime.date.today()
+    group_counts = {
+        "member_count": models.Count("memberships", distinct=True),
+        "post_count": models.Count("posts", distinct=True),
+        "last_post": models.Max("posts__posted_at"),
+    }
+    return [
+        ("group_list: meus grupos",
+         Group.objects.filter(memberships__user_id=user_id).select_related("created_by").annotate(**group_counts),
+         None),
+        ("group_list: outros grupos",
+         Group.objects.exclude(memberships__user_id=user_id).select_related("created_by").annotate(**group_counts),
+         None),
+        ("group_detail: postagens por -posted_at",
+         GamePost.objects.filter(group_id=group_id).select_related("game", "posted_by", "group").order_by("-posted_at"),
+         (GamePost, ["group", "-posted_at"])),
+        ("group_detail: membros",
+         GroupMembership.objects.filter(group_id=group_id).select_related("user"),
+         None),
+        ("Game: ordenação padrão (-date, -created_at)",
+         Game.objects.all()[:20],
+         (Game, ["-date", "-created_at"])),
+        ("api: partidas do grupo (keyset -date, -id)",
+         Game.objects.filter(posts__group_id=group_id).order_by("-date", "-id")[:50],
+         None),
+        ("dashboard: saldo do mês",
+         GameParticipation.objects.filter(
+             player_id=user_id, game__date__gte=today.replace(day=1), game__date__lte=today,
+         ).values("final_balance", "rebuy", "game__buy_in"),
+         None),
+        ("participações da partida",
+         GameParticipation.objects.filter(game_id=game_id).order_by("id"),
+         (GameParticipation, ["game", "id"])),
+        ("participação (partida, jogador)",
+         GameParticipation.objects.filter(game_id=game_id, player_id=user_id),
+         None),
+        ("feed: página",
+         FeedEntry.objects.filter(user_id=user_id).order_by("-id")[:30],
+         None),
+    ]
+
+
+def _has_index(model, fields) -> bool:
+    """O modelo já declara um índice (ou unique) começando por esses campos?"""
+    declared = [list(index.fields) for index in model._meta.indexes]
+    declared += [list(fields_) for fields_ in model._meta.unique_together]
+    return any(existing[:len(fields)] == fields for existing in declared)
+
+
+class Command(BaseCommand):
+    help = (
+        "Roda EXPLAIN QUERY PLAN nas consultas das views mais acessadas e aponta "
+        "varreduras completas e ordenações em TEMP B-TREE, sugerindo índices."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Mostra o plano completo de cada consulta.")
+        parser.add_argument("--check", action="store_true",
+                            help="Sai com erro se alguma consulta tiver sugestão de índice pendente (para CI).")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Os padrões de plano reconhecidos são os do SQLite.")
+
+        group_id = Group.objects.values_list("id", flat=True).first() or 0
+        user_id = get_user_model().objects.values_list("id", flat=True).first() or 0
+        game_id = Game.objects.values_list("id", flat=True).first() or 0
+
+        pending = {}
+        for name, qs, suggestion in _hot_queries(group_id, user_id, game_id):
+            plan = qs.explain()
+            scans = FULL_SCAN.findall(plan)
+            temps = TEMP_BTREE.findall(plan)
+
+            if not scans and not temps:
+                self.stdout.write(self.style.SUCCESS(f"ok    {name}"))
+            else:
+                problems = [f"SCAN {t}" for t in scans] + [f"TEMP B-TREE ({t.strip()})" for t in temps]
+                self.stdout.write(self.style.WARNING(f"ruim  {name}: {', '.join(problems)}"))
+                if suggestion and not _has_index(*suggestion):
+                    pending[(suggestion[0], tuple(suggestion[1]))] = name
+            if options["verbose_plans"] or (scans or temps):
+                for line in plan.splitlines():
+                    self.stdout.write(f"        {line}")
+
+        if not pending:
+            self.stdout.write(self.style.SUCCESS("Nenhum índice novo sugerido."))
+            return
+
+        self.stdout.write("\nÍndices sugeridos (adicione em Meta.indexes e rode makemigrations):")
+        with connection.schema_editor(collect_sql=True) as editor:
+            for (model, fields), name in pending.items():
+                index = models.Index(fields=list(fields))
+                index.set_name_with_model(model)
+                self.stdout.write(f"  {model.__name__}: models.Index(fields={list(fields)!r})  # {name}")
+                self.stdout.write(f"      {index.create_sql(model, editor)};")
+        if options["check"]:
+            raise CommandError(f"{len(pending)} índice(s) sugerido(s).")
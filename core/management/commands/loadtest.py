@@ -0,0 +1,200 @@
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from http.cookiejar import CookieJar
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Game, GameParticipation, GamePost, Group, GroupMembership
+
+PREFIX = "loadtest"
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Mede só a requisição em si; o redirect depois do POST não entra na conta.
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.locked = defaultdict(int)
+
+    def add(self, endpoint, seconds, ok, body):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+            if body and b"database is locked" in body:
+                self.locked[endpoint] += 1
+
+
+class _Player(threading.Thread):
+    """Um usuário simulado: login, e então N rodadas de leitura e escrita de resultado."""
+
+    def __init__(self, base_url, user_id, username, password, game_id, slug, rounds, think, stats):
+        super().__init__(name=f"loadtest-{username}", daemon=True)
+        self.base_url = base_url.rstrip("/")
+        self.user_id, self.username, self.password = user_id, username, password
+        self.game_id, self.slug = game_id, slug
+        self.rounds, self.think, self.stats = rounds, think, stats
+        self.cookies = CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect)
+
+    def _csrf(self):
+        return next((c.value for c in self.cookies if c.name == "csrftoken"), "")
+
+    def request(self, endpoint, path, data=None):
+        headers = {"Referer": self.base_url + "/"}
+        body = None
+        if data is not None:
+            data = {"csrfmiddlewaretoken": self._csrf(), **data}
+            body = urllib.parse.urlencode(data).encode()
+            headers["X-CSRFToken"] = self._csrf()
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers)
+        started = time.perf_counter()
+        status, content = None, b""
+        try:
+            with self.opener.open(req, timeout=30) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            status, content = exc.code, exc.read()
+        except OSError:
+            pass
+        # Um POST aceito redireciona; 200 num POST é o formulário voltando com erro.
+        ok = status is not None and (300 <= status < 400 if data is not None else status < 400)
+        self.stats.add(endpoint, time.perf_counter() - started, ok, content)
+        return status, content
+
+    def run(self):
+        self.request("login (GET)", "/account/login/")
+        status, _ = self.request("login (POST)", "/account/login/",
+                                 {"username": self.username, "password": self.password})
+        if status != 302:
+            return
+
+        part_id = None
+        for _ in range(self.rounds):
+            self.request("game_detail", f"/games/{self.game_id}/")
+            result = {"final_balance": f"{random.uniform(0, 300):.2f}", "rebuy": f"{random.choice([0, 0, 50]):.2f}"}
+            if part_id is None:
+                self.request("participation_add", f"/games/{self.game_id}/add-player/",
+                             {"player": self.user_id, **result})
+                part_id = self._participation_id()
+            else:
+                self.request("participation_edit", f"/games/{self.game_id}/participations/{part_id}/edit/",
+                             {"player": self.user_id, **result})
+            self.request("group_detail", f"/groups/{self.slug}/")
+            if self.think:
+                time.sleep(random.uniform(0, self.think))
+
+    def _participation_id(self):
+        status, content = self.request("api game_detail", f"/api/v1/games/{self.game_id}/?fields=participations")
+        if status != 200:
+            return None
+        for row in json.loads(content)["participations"]:
+            if row["player_id"] == self.user_id:
+                return row["id"]
+        return None
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Simula o fim de várias partidas ao mesmo tempo contra um servidor rodando "
+        "(local, no mesmo banco): usuários concorrentes fazem login, abrem a partida, "
+        "lançam e editam resultados e recarregam o grupo. Reporta vazão, latências, "
+        "erros e 'database is locked' por endpoint (este último só aparece com DEBUG=1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000")
+        parser.add_argument("--groups", type=int, default=5, help="Grupos/partidas simultâneas (padrão: 5).")
+        parser.add_argument("--players", type=int, default=8, help="Jogadores por partida (padrão: 8).")
+        parser.add_argument("--rounds", type=int, default=10, help="Rodadas por jogador (padrão: 10).")
+        parser.add_argument("--think", type=float, default=0.0, help="Pausa máxima entre rodadas, em segundos.")
+        parser.add_argument("--password", default="loadtest-pass")
+
+    def handle(self, *args, **options):
+        plan = self._prepare(options["groups"], options["players"], options["password"])
+        stats = _Stats()
+        players = [
+            _Player(options["base_url"], user_id, username, options["password"], game_id, slug,
+                    options["rounds"], options["think"], stats)
+            for user_id, username, game_id, slug in plan
+        ]
+
+        self.stdout.write(f"{len(players)} usuários em {options['groups']} partidas contra {options['base_url']}…")
+        started = time.perf_counter()
+        for player in players:
+            player.start()
+        for player in players:
+            player.join()
+        elapsed = time.perf_counter() - started or 1e-9
+
+        if not stats.latencies:
+            raise CommandError("Nenhuma requisição completou; o servidor está rodando?")
+        self._report(stats, elapsed)
+
+    @transaction.atomic
+    def _prepare(self, groups, players, password):
+        """Cria (uma vez) os usuários, grupos e partidas do teste e zera os resultados."""
+        User = get_user_model()
+        password_hash = make_password(password)
+        owner, _ = User.objects.get_or_create(username=f"{PREFIX}-owner", defaults={"password": password_hash})
+        today = timezone.localdate()
+
+        plan = []
+        for g in range(groups):
+            group = Group.objects.filter(name=f"{PREFIX} {g}").first()
+            if group is None:
+                group = Group.objects.create(name=f"{PREFIX} {g}", created_by=owner)
+            game = Game.objects.filter(posts__group=group, title=f"{PREFIX} {g}").first()
+            if game is None:
+                game = Game.objects.create(title=f"{PREFIX} {g}", date=today, buy_in=100, created_by=owner)
+                GamePost.objects.create(game=game, group=group, posted_by=owner)
+
+            names = [f"{PREFIX}-{g}-{p}" for p in range(players)]
+            existing = set(User.objects.filter(username__in=names).values_list("username", flat=True))
+            User.objects.bulk_create([User(username=n, password=password_hash) for n in names if n not in existing])
+            User.objects.filter(username__in=names).update(password=password_hash)
+            users = list(User.objects.filter(username__in=names).order_by("username"))
+            GroupMembership.objects.bulk_create(
+                [GroupMembership(group=group, user=u) for u in users], ignore_conflicts=True,
+            )
+            GameParticipation.objects.filter(game=game).delete()
+            plan += [(u.pk, u.username, game.pk, group.slug) for u in users]
+        return plan
+
+    def _report(self, stats, elapsed):
+        total = sum(len(v) for v in stats.latencies.values())
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{total} requisições em {elapsed:.1f}s ({total / elapsed:.1f} req/s)"
+        ))
+        header = f"{'endpoint':<22}{'n':>6}{'req/s':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'erros':>7}{'locked':>8}"
+        self.stdout.write(header)
+        for endpoint, values in sorted(stats.latencies.items()):
+            ms = [v * 1000 for v in values]
+            errors, locked = stats.errors[endpoint], stats.locked[endpoint]
+            line = (
+                f"{endpoint:<22}{len(ms):>6}{len(ms) / elapsed:>8.1f}"
+                f"{_percentile(ms, 50):>9.1f}{_percentile(ms, 90):>9.1f}{_percentile(ms, 99):>9.1f}{max(ms):>9.1f}"
+                f"{errors:>7}{locked:>8}"
+            )
+            self.stdout.write(self.style.ERROR(line) if errors or locked else line)
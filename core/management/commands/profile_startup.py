@@ -0,0 +1,165 @@
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Módulos que não devem ser carregados no boot de um worker (imports lazy).
+HEAVY_MODULES = ("numpy", "PIL", "core.ratings", "core.stats")
+
+# Roda num processo novo (com -X importtime) e imprime as fases em JSON.
+PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+phases, ready = {}, {}
+
+from django.apps.config import AppConfig
+_create = AppConfig.create.__func__
+
+def _timed_create(cls, entry):
+    config = _create(cls, entry)
+    original = config.ready
+    def ready_wrapper():
+        t = time.perf_counter()
+        original()
+        ready[config.label] = time.perf_counter() - t
+    config.ready = ready_wrapper
+    return config
+
+AppConfig.create = classmethod(_timed_create)
+
+def phase(name, func):
+    t = time.perf_counter()
+    func()
+    phases[name] = time.perf_counter() - t
+
+import django
+from django.conf import settings
+phase("settings", lambda: settings.INSTALLED_APPS)
+phase("setup", lambda: django.setup(set_prefix=False))
+phase("wsgi_application", lambda: __import__("pokerdex.wsgi"))
+phase("asgi_application", lambda: __import__("pokerdex.asgi"))
+
+def _urls():
+    from django.urls import get_resolver
+    resolver = get_resolver()
+    resolver.resolve("/")
+    resolver.reverse_dict
+phase("urlconf", _urls)
+
+phases["total"] = time.perf_counter() - started
+print(json.dumps({
+    "phases": phases,
+    "ready": ready,
+    "heavy_loaded": [m for m in HEAVY if m in sys.modules],
+}))
+"""
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _parse_importtime(stderr: str):
+    """(módulo, self µs, cumulativo µs, profundidade) de cada linha do -X importtime."""
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o cold start: tempo de import por módulo (-X importtime), AppConfig.ready, "
+        "carga das aplicações WSGI/ASGI, URLconf e o boot do manage.py."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Execuções do manage.py para a mediana (padrão: 3).")
+        parser.add_argument("--top", type=int, default=15, help="Quantos módulos listar (padrão: 15).")
+        parser.add_argument("--json", dest="json_path",
+                            help="Acrescenta o relatório (uma linha JSON) a este arquivo, para comparar entre releases.")
+
+    def handle(self, *args, **options):
+        base_dir = Path(settings.BASE_DIR)
+        env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+
+        probe = f"HEAVY = {HEAVY_MODULES!r}\n{PROBE}"
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", probe],
+            cwd=base_dir, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Falha ao carregar a aplicação:\n{result.stderr[-2000:]}")
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        modules = _parse_importtime(result.stderr)
+
+        boots = []
+        for _ in range(max(1, options["runs"])):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, "manage.py", "version"], cwd=base_dir, env=env,
+                           capture_output=True, check=True)
+            boots.append(time.perf_counter() - started)
+        report["manage_py"] = statistics.median(boots)
+
+        by_package = defaultdict(int)
+        for name, self_us, _, _ in modules:
+            by_package[name.split(".")[0]] += self_us
+        report["imports_total"] = sum(self_us for _, self_us, _, _ in modules) / 1e6
+        report["top_modules"] = [
+            {"module": name, "cumulative": cumulative / 1e6}
+            for name, _, cumulative, _ in sorted(modules, key=lambda m: m[2], reverse=True)[:options["top"]]
+        ]
+        report["top_packages"] = {
+            name: us / 1e6 for name, us in sorted(by_package.items(), key=lambda i: i[1], reverse=True)[:options["top"]]
+        }
+
+        self._print(report)
+        if options["json_path"]:
+            record = {
+                "at": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                **report,
+            }
+            with open(options["json_path"], "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+            self.stdout.write(f"\nRelatório acrescentado a {options['json_path']}")
+
+    def _print(self, report):
+        def ms(seconds):
+            return f"{seconds * 1000:8.1f} ms"
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Fases do boot"))
+        for name, seconds in report["phases"].items():
+            self.stdout.write(f"  {name:<20}{ms(seconds)}")
+        self.stdout.write(f"  {'manage.py (mediana)':<20}{ms(report['manage_py'])}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING("AppConfig.ready"))
+        for label, seconds in sorted(report["ready"].items(), key=lambda i: i[1], reverse=True):
+            self.stdout.write(f"  {label:<20}{ms(seconds)}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Imports ({report['imports_total'] * 1000:.0f} ms no total)"))
+        for name, seconds in report["top_packages"].items():
+            self.stdout.write(f"  {name:<40}{ms(seconds)}")
+        self.stdout.write(self.style.MIGRATE_HEADING("Módulos mais lentos (cumulativo)"))
+        for row in report["top_modules"]:
+            self.stdout.write(f"  {row['module']:<40}{ms(row['cumulative'])}")
+
+        if report["heavy_loaded"]:
+            self.stdout.write(self.style.WARNING(
+                "Carregados no boot (deveriam ser lazy): " + ", ".join(report["heavy_loaded"])
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS("Nenhum módulo pesado carregado no boot."))
@@ -0,0 +1,58 @@
+import csv
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core import changelog
+from core.models import ChangeLogEntry, Group, GroupMembership, allocate_slugs
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria grupos em lote a partir de um CSV (colunas: name, description), "
+        "em uma única transação. O criador informado vira admin de todos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Arquivo CSV com cabeçalho 'name,description'.")
+        parser.add_argument("--creator", required=True, help="Username do criador/admin dos grupos.")
+
+    def handle(self, *args, **options):
+        creator = get_user_model().objects.filter(username=options["creator"]).first()
+        if creator is None:
+            raise CommandError(f"Usuário '{options['creator']}' não encontrado.")
+
+        with open(options["path"], newline="", encoding="utf-8") as fh:
+            rows = [
+                (row["name"].strip(), (row.get("description") or "").strip())
+                for row in csv.DictReader(fh)
+                if (row.get("name") or "").strip()
+            ]
+        if not rows:
+            raise CommandError("Nenhum grupo no arquivo (a coluna 'name' é obrigatória).")
+
+        with transaction.atomic():
+            existing = set(Group.all_objects.filter(name__in=[name for name, _ in rows]).values_list("name", flat=True))
+            seen = set()
+            pending = []
+            for name, description in rows:
+                if name in existing or name in seen:
+                    self.stdout.write(self.style.WARNING(f"Ignorado (nome já existe): {name}"))
+                    continue
+                seen.add(name)
+                pending.append((name, description))
+
+            slugs = allocate_slugs([name for name, _ in pending])
+            groups = Group.objects.bulk_create([
+                Group(name=name, description=description, slug=slug, created_by=creator)
+                for (name, description), slug in zip(pending, slugs)
+            ], batch_size=500)
+            memberships = GroupMembership.objects.bulk_create([
+                GroupMembership(user=creator, group=group, role=GroupMembership.Role.ADMIN) for group in groups
+            ], batch_size=500)
+            # bulk_create não dispara os sinais: registra no log de sincronização aqui.
+            for membership in memberships:
+                changelog.record_many(membership.group_id, [membership], ChangeLogEntry.Op.INSERT)
+
+        self.stdout.write(self.style.SUCCESS(f"{len(groups)} grupos criados."))
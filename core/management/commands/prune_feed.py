@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core import feed
+
+
+class Command(BaseCommand):
+    help = "Poda o feed de atividades, mantendo os itens mais recentes de cada usuário."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--keep", type=int, default=feed.MAX_ENTRIES,
+                            help=f"Itens mantidos por usuário (padrão: {feed.MAX_ENTRIES}).")
+
+    def handle(self, *args, **options):
+        deleted = feed.prune(keep=options["keep"])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} itens removidos."))
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from core import idempotency
+
+
+class Command(BaseCommand):
+    help = "Remove as chaves de idempotência antigas (reenvios depois disso gravam de novo)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=int, default=int(idempotency.TTL.total_seconds() // 3600),
+                            help="Idade mínima, em horas, das chaves removidas (padrão: 24).")
+
+    def handle(self, *args, **options):
+        deleted = idempotency.prune(timedelta(hours=options["hours"]))
+        self.stdout.write(self.style.SUCCESS(f"{deleted} chaves removidas."))
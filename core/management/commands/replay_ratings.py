@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import ratings
+from core.models import Group
+
+
+class Command(BaseCommand):
+    help = "Recalcula do zero os ratings (Elo multijogador) dos grupos (ou desde o último ano arquivado)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", dest="slug", help="Slug de um grupo específico (padrão: todos).")
+
+    def handle(self, *args, **options):
+        groups = Group.objects.all()
+        if options["slug"]:
+            groups = groups.filter(slug=options["slug"])
+            if not groups.exists():
+                raise CommandError(f"Grupo '{options['slug']}' não encontrado.")
+
+        for group in groups.only("id", "name"):
+            started = time.perf_counter()
+            count = ratings.replay_from(group.pk)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{group.name}: {count} participações em {elapsed:.2f}s")
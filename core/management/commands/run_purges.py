@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from core import purge
+from core.models import PurgeJob
+
+
+class Command(BaseCommand):
+    help = "Retoma as remoções em lotes pendentes ou interrompidas (ex.: após um restart)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--failed", action="store_true", help="Também tenta de novo os jobs que falharam.")
+
+    def handle(self, *args, **options):
+        statuses = [PurgeJob.Status.PENDING, PurgeJob.Status.RUNNING]
+        if options["failed"]:
+            statuses.append(PurgeJob.Status.FAILED)
+
+        for job in PurgeJob.objects.filter(status__in=statuses).order_by("id"):
+            purge.run(job.pk)
+            job.refresh_from_db()
+            style = self.style.SUCCESS if job.status == PurgeJob.Status.DONE else self.style.ERROR
+            self.stdout.write(style(f"{job}: {job.deleted_rows}/{job.total_rows} linhas"))
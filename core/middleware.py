@@ -0,0 +1,159 @@
+"""
+Middlewares do projeto.
+"""
+import mimetypes
+import mmap
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date
+
+# Nome gerado pelo ManifestStaticFilesStorage: style.3f2a9c0d1e4b.css
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^/]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=300"
+CHUNK_SIZE = 64 * 1024
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class _StaticFile:
+    """Arquivo mapeado em memória uma vez por processo e compartilhado entre requests."""
+
+    def __init__(self, path: Path):
+        stat = path.stat()
+        self.size = stat.st_size
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        self.last_modified = http_date(stat.st_mtime)
+        self.data = b""
+        if self.size:
+            with open(path, "rb") as fh:
+                self.data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def chunks(self):
+        view = memoryview(self.data)
+        for start in range(0, self.size, CHUNK_SIZE):
+            yield view[start:start + CHUNK_SIZE]
+
+
+class StaticFilesMiddleware:
+    """
+    Serve o STATIC_ROOT direto do gunicorn, sem servidor web na frente.
+    Escolhe a variante .br/.gz pré-comprimida pelo Accept-Encoding, responde
+    304 por ETag e marca os nomes com hash como imutáveis.
+    Fica logo depois do SecurityMiddleware.
+    """
+
+    encodings = ENCODINGS
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        root, self.prefix = self.location()
+        if root is None or not self.prefix.startswith("/") or not root.is_dir():
+            raise MiddlewareNotUsed
+        self.root = root.resolve()
+        self._files: dict[str, _StaticFile] = {}
+        self._lock = threading.Lock()
+
+    def location(self):
+        """(diretório, prefixo de URL) servidos."""
+        if not settings.STATIC_ROOT:
+            return None, ""
+        return Path(settings.STATIC_ROOT), settings.STATIC_URL or ""
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD") and request.path_info.startswith(self.prefix):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def _file(self, name: str) -> _StaticFile | None:
+        try:
+            return self._files[name]
+        except KeyError:
+            pass
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root) or not path.is_file():
+            return None  # não guarda ausências: URLs arbitrárias não crescem o cache
+        with self._lock:
+            return self._files.setdefault(name, _StaticFile(path))
+
+    def serve(self, request, name: str):
+        if not name or name.endswith("/") or name.endswith((".gz", ".br")):
+            return None
+        original = self._file(name)
+        if original is None:
+            return None
+
+        accepted = request.headers.get("Accept-Encoding", "")
+        static_file, encoding = original, None
+        for candidate, suffix in self.encodings:
+            if candidate in accepted:
+                variant = self._file(name + suffix)
+                if variant is not None:
+                    static_file, encoding = variant, candidate
+                    break
+
+        headers = {
+            "Cache-Control": IMMUTABLE if HASHED_NAME.search(name) else REVALIDATE,
+            "ETag": static_file.etag,
+            "Last-Modified": static_file.last_modified,
+            "Vary": "Accept-Encoding",
+        }
+        if request.headers.get("If-None-Match") == static_file.etag:
+            response = HttpResponseNotModified()
+        else:
+            content_type, _ = mimetypes.guess_type(name)
+            content_type = content_type or "application/octet-stream"
+            if request.method == "HEAD":
+                response = HttpResponse(content_type=content_type)
+            else:
+                response = StreamingHttpResponse(static_file.chunks(), content_type=content_type)
+            response["Content-Length"] = str(static_file.size)
+            if encoding:
+                response["Content-Encoding"] = encoding
+        for header, value in headers.items():
+            response[header] = value
+        return response
+
+
+class ThumbnailMiddleware(StaticFilesMiddleware):
+    """
+    Serve as miniaturas das fotos de grupo (core/thumbnails.py). Só o
+    diretório das variantes fica exposto, nunca os originais enviados.
+    """
+    encodings = ()
+
+    def location(self):
+        from .thumbnails import THUMBNAIL_DIR
+
+        if not settings.MEDIA_ROOT:
+            return None, ""
+        root = Path(settings.MEDIA_ROOT) / THUMBNAIL_DIR
+        root.mkdir(parents=True, exist_ok=True)
+        return root, f"{settings.MEDIA_URL}{THUMBNAIL_DIR}/"
+
+
+class AuditActorMiddleware:
+    """
+    Torna o usuário da requisição o autor das alterações gravadas no
+    histórico (core/audit.py). Fica depois do AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        from .audit import acting_as
+
+        self.get_response = get_response
+        self.acting_as = acting_as
+
+    def __call__(self, request):
+        # Uma função, e não o próprio request.user (lazy): o asgiref inspeciona
+        # os contextvars ao entrar numa view assíncrona, o que consultaria a
+        # sessão fora de uma thread. Assim o usuário só é lido se houver algo
+        # para registrar.
+        with self.acting_as(lambda: request.user):
+            return self.get_response(request)
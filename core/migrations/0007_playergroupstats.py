@@ -0,0 +1,38 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_playerrating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerGroupStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('total_net', models.FloatField(default=0)),
+                ('mean_net', models.FloatField(default=0)),
+                ('variance', models.FloatField(default=0)),
+                ('stddev', models.FloatField(default=0)),
+                ('longest_win_streak', models.PositiveIntegerField(default=0)),
+                ('longest_loss_streak', models.PositiveIntegerField(default=0)),
+                ('roi', models.FloatField(default=0)),
+                ('rebuy_rate', models.FloatField(default=0)),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='core.group')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('group', 'player')},
+            },
+        ),
+    ]
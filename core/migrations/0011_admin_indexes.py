@@ -0,0 +1,27 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_purgejob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['-date', '-created_at'], name='core_game_date_df50a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gameparticipation',
+            index=models.Index(fields=['created_at'], name='core_gamepa_created_15a4c4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gamepost',
+            index=models.Index(fields=['posted_at'], name='core_gamepo_posted__3c0259_idx'),
+        ),
+    ]
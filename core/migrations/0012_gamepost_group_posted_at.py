@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_admin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gamepost',
+            index=models.Index(fields=['group', '-posted_at'], name='core_gamepo_group_i_932cca_idx'),
+        ),
+    ]
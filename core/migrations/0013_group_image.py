@@ -0,0 +1,23 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_gamepost_group_posted_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to='groups/', verbose_name='Foto do grupo'),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='thumbnails',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
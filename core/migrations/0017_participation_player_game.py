@@ -0,0 +1,27 @@
+# Generated by Django 5.0.7 on 2026-10-19 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='gameparticipation',
+            name='core_gamepa_player__6676ff_idx',
+        ),
+        migrations.AddIndex(
+            model_name='archivedparticipation',
+            index=models.Index(fields=['player', 'game'], name='core_archiv_player__48239c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gameparticipation',
+            index=models.Index(fields=['player', 'game'], name='core_gamepa_player__795770_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.conf import settings
-from django.db import models
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.core.validators import MinValueValidator
 from django.utils.text import slugify
@@ -7,6 +10,39 @@ from django.utils.text import slugify
 User = settings.AUTH_USER_MODEL
 
 
+class LoadedValuesMixin:
+    """
+    Guarda os valores lidos do banco em '_loaded_values' para que os sinais
+    saibam o que mudou num save() sem precisar de uma nova consulta.
+
+    O save() e os sinais que ele dispara (rollups, ratings, change log,
+    histórico) rodam numa única transação: ou tudo é gravado, ou nada. Com
+    transaction_mode IMMEDIATE (ver settings) o lock de escrita é pego antes
+    das leituras dos sinais.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def loaded_value(self, attname):
+        return getattr(self, "_loaded_values", {}).get(attname)
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+        self._loaded_values = {f.attname: getattr(self, f.attname) for f in self._meta.concrete_fields}
+
+
+class VisibleManager(models.Manager):
+    """Esconde os objetos já marcados para remoção (ver core/purge.py)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(hidden_at__isnull=True)
+
+
 class Group(models.Model):
     """
     Um grupo onde partidas podem ser postadas.
@@ -15,9 +51,18 @@ class Group(models.Model):
     name = models.CharField(max_length=120, unique=True)
     slug = models.SlugField(max_length=140, unique=True, blank=False)
     description = models.TextField(blank=True)
-    # image = models.ImageField("Foto do grupo", upload_to="groups/", blank=True, null=True)
+    image = models.ImageField("Foto do grupo", upload_to="groups/", blank=True, null=True)
+    # Variantes geradas em segundo plano a partir de 'image' (ver core/thumbnails.py)
+    thumbnails = models.JSONField(default=dict, blank=True, editable=False)
     created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name="groups_created")
     created_at = models.DateTimeField(default=timezone.now)
+    # Último número de sequência do change log do grupo (ver core/changelog.py)
+    change_seq = models.PositiveBigIntegerField(default=0, editable=False)
+    # Preenchido ao deletar; as linhas relacionadas são apagadas em lotes depois
+    hidden_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ["name"]
@@ -25,16 +70,90 @@ class Group(models.Model):
     def __str__(self):
         return self.name
 
+    def _thumbnail(self, size):
+        variants = (self.thumbnails or {}).get("variants", {})
+        if size not in variants or self.thumbnails.get("source") != (self.image.name or ""):
+            return None
+        variant = variants[size]
+        return {
+            "webp": default_storage.url(variant["webp"]) if "webp" in variant else None,
+            "jpeg": default_storage.url(variant["jpeg"]),
+            "width": variant["width"],
+            "height": variant["height"],
+        }
+
+    @property
+    def thumbnail_sm(self):
+        return self._thumbnail("sm")
+
+    @property
+    def thumbnail_md(self):
+        return self._thumbnail("md")
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.name)
-            candidate = base
-            i = 1
-            while Group.objects.filter(slug=candidate).exclude(pk=self.pk).exists():
-                i += 1
-                candidate = f"{base}-{i}"
-            self.slug = candidate
-        super().save(*args, **kwargs)
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # change_seq só é incrementado pelo change log e thumbnails só pelo
+            # worker de miniaturas; um save completo nunca os sobrescreve.
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in ("change_seq", "thumbnails")
+            ]
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        # Outro create com o mesmo nome pode levar o slug entre a leitura e o
+        # INSERT; nesse caso aloca de novo a partir do estado atual.
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = allocate_slugs([self.name], exclude_pk=self.pk)[0]
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                taken = Group.all_objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                if not taken or attempt == SLUG_ATTEMPTS - 1:
+                    self.slug = ""
+                    raise
+
+
+SLUG_ATTEMPTS = 5
+SLUG_LOOKUP_CHUNK = 200
+
+
+def allocate_slugs(names, exclude_pk=None) -> list[str]:
+    """
+    Slugs livres para uma lista de nomes, com uma única consulta: lê os slugs
+    'base' e 'base-N' já usados e continua a partir do maior sufixo. Nomes
+    repetidos na lista recebem sufixos diferentes.
+    """
+    if not names:
+        return []
+    bases = [slugify(name)[:130] or "grupo" for name in names]
+    unique_bases = sorted(set(bases))
+    used = set()
+    # Em blocos: o SQLite recusa um WHERE com OR demais ("Expression tree is too large").
+    for start in range(0, len(unique_bases), SLUG_LOOKUP_CHUNK):
+        lookup = Q()
+        for base in unique_bases[start:start + SLUG_LOOKUP_CHUNK]:
+            lookup |= Q(slug=base) | Q(slug__startswith=f"{base}-")
+        used.update(Group.all_objects.filter(lookup).exclude(pk=exclude_pk).values_list("slug", flat=True))
+
+    top = {}
+    slugs = []
+    for base in bases:
+        if base not in used:
+            slug = base
+        else:
+            if base not in top:
+                prefix = f"{base}-"
+                top[base] = max(
+                    (int(s[len(prefix):]) for s in used if s.startswith(prefix) and s[len(prefix):].isdigit()),
+                    default=1,
+                )
+            top[base] += 1
+            slug = f"{base}-{top[base]}"
+        used.add(slug)
+        slugs.append(slug)
+    return slugs
 
 
 class GroupMembership(models.Model):
@@ -108,7 +227,7 @@ class GroupRequest(models.Model):
 
     def __str__(self):
         return f"Request({self.requested_by} -> {self.group})"
-class Game(models.Model):
+class Game(LoadedValuesMixin, models.Model):
     """
     Uma partida de poker. Pode ser postada em 1+ grupos.
     """
@@ -123,9 +242,16 @@ class Game(models.Model):
 
     # Grupos onde esta partida foi postada
     groups = models.ManyToManyField(Group, through="GamePost", related_name="games")
+    hidden_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = VisibleManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ["-date", "-created_at"]
+        indexes = [
+            models.Index(fields=["-date", "-created_at"]),
+        ]
 
     def __str__(self):
         label = self.title or f"Partida em {self.date.strftime('%d/%m/%Y')}"
@@ -146,13 +272,15 @@ class GamePost(models.Model):
         unique_together = ("game", "group")
         indexes = [
             models.Index(fields=["group", "game"]),
+            models.Index(fields=["group", "-posted_at"]),
+            models.Index(fields=["posted_at"]),
         ]
 
     def __str__(self):
         return f"{self.game} @ {self.group}"
 
 
-class GameParticipation(models.Model):
+class GameParticipation(LoadedValuesMixin, models.Model):
     """
     Participação de um jogador em uma partida, com o saldo final.
     'final_balance' é o resultado líquido do jogador (pode ser negativo).
@@ -169,7 +297,301 @@ class GameParticipation(models.Model):
         unique_together = ("game", "player")
         indexes = [
             models.Index(fields=["game"]),
-            models.Index(fields=["player"]),
+            # Caminho jogador -> partidas das estatísticas entre grupos (core/crossgroup.py)
+            models.Index(fields=["player", "game"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} in {self.game} -> {self.final_balance}"
+
+
+class PlayerMonthlyStat(models.Model):
+    """
+    Rollup mensal do desempenho de um jogador em um grupo.
+    Mantido incrementalmente a partir das participações (ver core/rollups.py);
+    rankings de mês, temporada ou geral viram somas de poucas linhas.
+    """
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="monthly_stats")
+    player = models.ForeignKey(User, on_delete=models.CASCADE, related_name="monthly_stats")
+    month = models.DateField()  # sempre o dia 1 do mês
+    games = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    invested = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    final_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    rebuy = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    net = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ("group", "player", "month")
+        indexes = [
+            models.Index(fields=["group", "month"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} @ {self.group} ({self.month:%m/%Y}) -> {self.net}"
+
+
+class PlayerYearlyStat(models.Model):
+    """
+    Totais anuais de um jogador em um grupo referentes às partidas já
+    arquivadas (ver core/archive.py). Os rankings somam estas linhas às de
+    PlayerMonthlyStat, que só cobrem as partidas ainda na tabela principal.
+    """
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="yearly_stats")
+    player = models.ForeignKey(User, on_delete=models.CASCADE, related_name="yearly_stats")
+    year = models.PositiveSmallIntegerField()
+    games = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    invested = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    final_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    rebuy = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    net = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ("group", "player", "year")
+
+    def __str__(self):
+        return f"{self.player} @ {self.group} ({self.year}) -> {self.net}"
+
+
+class PlayerRating(models.Model):
+    """
+    Rating (Elo multijogador) de um jogador em um grupo.
+    'history' guarda pares (data, rating) empacotados em binário para gráficos;
+    ver core/ratings.py.
+    """
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="ratings")
+    player = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ratings")
+    rating = models.FloatField(default=1500.0)
+    games = models.PositiveIntegerField(default=0)
+    last_date = models.DateField(null=True, blank=True)
+    history = models.BinaryField(default=bytes)
+
+    class Meta:
+        unique_together = ("group", "player")
+        indexes = [
+            models.Index(fields=["group", "rating"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} @ {self.group}: {self.rating:.0f}"
+
+
+class PlayerGroupStats(models.Model):
+    """
+    Estatísticas consolidadas de um jogador em um grupo, calculadas em lote
+    pelo comando 'compute_stats' (ver core/stats.py).
+    """
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="player_stats")
+    player = models.ForeignKey(User, on_delete=models.CASCADE, related_name="group_stats")
+    games = models.PositiveIntegerField(default=0)
+    total_net = models.FloatField(default=0)
+    mean_net = models.FloatField(default=0)
+    variance = models.FloatField(default=0)
+    stddev = models.FloatField(default=0)
+    longest_win_streak = models.PositiveIntegerField(default=0)
+    longest_loss_streak = models.PositiveIntegerField(default=0)
+    roi = models.FloatField(default=0)  # saldo / total investido
+    rebuy_rate = models.FloatField(default=0)  # fração das partidas com rebuy
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("group", "player")
+
+    def __str__(self):
+        return f"Stats({self.player} @ {self.group})"
+
+
+class FeedEntry(models.Model):
+    """
+    Item do feed de atividades de um usuário.
+    Gravado por fan-out na escrita (uma linha por destinatário); a leitura é
+    uma varredura no índice (user, id). Ver core/feed.py.
+    """
+    class Kind(models.TextChoices):
+        GAME_POSTED = "GAME_POSTED", "Nova partida"
+        RESULT = "RESULT", "Resultado registrado"
+        REQUEST_ACCEPTED = "REQUEST_ACCEPTED", "Pedido aceito"
+        PROMOTED = "PROMOTED", "Promovido a administrador"
+        DEMOTED = "DEMOTED", "Administração removida"
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="feed_entries")
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "-id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} -> {self.user}"
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Registro de alteração para sincronização incremental de um grupo.
+    'seq' é monotônico por grupo; clientes pedem "mudanças desde o cursor N".
+    """
+    class Op(models.TextChoices):
+        INSERT = "INSERT", "Inserção"
+        UPDATE = "UPDATE", "Alteração"
+        DELETE = "DELETE", "Remoção"
+
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="changes")
+    seq = models.PositiveBigIntegerField()
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    op = models.CharField(max_length=6, choices=Op.choices)
+    data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("group", "seq")
+
+    def __str__(self):
+        return f"#{self.seq} {self.op} {self.model}:{self.object_id} @ {self.group_id}"
+
+
+class PurgeJob(models.Model):
+    """
+    Remoção em segundo plano de um grupo ou partida já escondidos.
+    As linhas relacionadas são apagadas em lotes (ver core/purge.py).
+    """
+    class Target(models.TextChoices):
+        GROUP = "GROUP", "Grupo"
+        GAME = "GAME", "Partida"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pendente"
+        RUNNING = "RUNNING", "Em andamento"
+        DONE = "DONE", "Concluída"
+        FAILED = "FAILED", "Falhou"
+
+    target = models.CharField(max_length=5, choices=Target.choices)
+    object_id = models.BigIntegerField()
+    label = models.CharField(max_length=140, blank=True)
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    status = models.CharField(max_length=7, choices=Status.choices, default=Status.PENDING)
+    total_rows = models.PositiveIntegerField(default=0)
+    deleted_rows = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status"]),
+        ]
+
+    def __str__(self):
+        return f"Purge {self.get_target_display()} {self.label or self.object_id} ({self.status})"
+
+    @property
+    def progress(self) -> int:
+        """Percentual de linhas já apagadas."""
+        if not self.total_rows:
+            return 100 if self.status == self.Status.DONE else 0
+        return min(100, self.deleted_rows * 100 // self.total_rows)
+
+
+class IdempotencyKey(models.Model):
+    """
+    Chave enviada pelo cliente num POST (campo 'idempotency_key' ou cabeçalho
+    Idempotency-Key). Uma nova tentativa com a mesma chave recebe a resposta
+    original em vez de gravar de novo (ver core/idempotency.py).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    key = models.CharField(max_length=64)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    location = models.CharField(max_length=500, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("user", "key")
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.key} -> {self.status_code} {self.location}"
+
+
+class AuditEntry(models.Model):
+    """
+    Histórico (só acréscimo) das alterações de uma partida e das suas
+    participações: quem mudou o quê, com os valores antigo e novo de cada
+    campo alterado. Gravado na mesma transação da escrita (ver core/audit.py).
+    """
+    class Action(models.TextChoices):
+        CREATE = "CREATE", "Criação"
+        UPDATE = "UPDATE", "Alteração"
+        DELETE = "DELETE", "Remoção"
+
+    # SET_NULL: o histórico sobrevive à remoção da partida (model/object_id ficam).
+    game = models.ForeignKey(Game, on_delete=models.SET_NULL, null=True, blank=True, related_name="audit_entries")
+    # No lugar de 'game' depois que a partida é arquivada (ver core/archive.py).
+    archived_game = models.ForeignKey(
+        "ArchivedGame", on_delete=models.CASCADE, null=True, blank=True, related_name="audit_entries",
+    )
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=Action.choices)
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    # {campo: [antigo, novo]}
+    changes = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["game", "-id"]),
+            models.Index(fields=["archived_game", "-id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.model}:{self.object_id} @ game {self.game_id or self.archived_game_id}"
+
+
+class ArchivedGame(models.Model):
+    """
+    Partida antiga movida para fora das tabelas principais (ver core/archive.py).
+    Mantém o id original, então /games/<pk>/ continua funcionando.
+    """
+    id = models.IntegerField(primary_key=True)
+    title = models.CharField(max_length=140, blank=True)
+    date = models.DateField()
+    location = models.CharField(max_length=180, blank=True)
+    buy_in = models.DecimalField(max_digits=10, decimal_places=2)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name="+")
+    created_at = models.DateTimeField()
+    # Ids dos grupos em que a partida estava postada
+    group_ids = models.JSONField(default=list)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-date", "-created_at"]
+
+    def __str__(self):
+        return self.title or f"Partida em {self.date.strftime('%d/%m/%Y')}"
+
+
+class ArchivedParticipation(models.Model):
+    game = models.ForeignKey(ArchivedGame, on_delete=models.CASCADE, related_name="participations")
+    player = models.ForeignKey(User, on_delete=models.PROTECT, related_name="+")
+    rebuy = models.DecimalField(max_digits=10, decimal_places=2, default=0, null=True)
+    final_balance = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("game", "player")
+        indexes = [
+            models.Index(fields=["player", "game"]),
         ]
 
     def __str__(self):
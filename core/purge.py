@@ -0,0 +1,107 @@
+"""
+Remoção de grupos e partidas em duas etapas.
+
+A view apenas esconde o objeto (hidden_at) e agenda um PurgeJob; uma thread
+em segundo plano apaga as linhas relacionadas em lotes pequenos, cada um em
+sua própria transação, para não segurar o lock de escrita do SQLite nem
+carregar milhares de objetos na memória do collector. Jobs interrompidos
+(restart do servidor) são retomados com 'manage.py run_purges'.
+"""
+import threading
+import time
+import traceback
+from functools import partial
+
+from django.db import connections, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import audit, changelog, signals
+from .models import AuditEntry, ChangeLogEntry, Game, GamePost, Group, PurgeJob
+
+BATCH_SIZE = 500
+PAUSE_SECONDS = 0.05  # folga entre lotes para as requisições escreverem
+
+_MODELS = {
+    PurgeJob.Target.GROUP: Group,
+    PurgeJob.Target.GAME: Game,
+}
+
+
+@transaction.atomic
+def schedule(obj, requested_by=None) -> PurgeJob:
+    """Esconde o grupo/partida e agenda a remoção em lotes após o commit."""
+    if isinstance(obj, Game):
+        target = PurgeJob.Target.GAME
+        group_ids = changelog.groups_for(obj)
+        # Poucas linhas (uma por grupo); os sinais recalculam rollups e ratings
+        # dos grupos enquanto a partida ainda é visível.
+        GamePost.objects.filter(game=obj).delete()
+        # O _run apaga com os sinais desligados: a remoção entra no histórico
+        # aqui, com o autor da requisição.
+        audit.record(obj, AuditEntry.Action.DELETE)
+    else:
+        target = PurgeJob.Target.GROUP
+        group_ids = []
+
+    now = timezone.now()
+    type(obj).all_objects.filter(pk=obj.pk).update(hidden_at=now)
+    obj.hidden_at = now
+    changelog.record(group_ids, obj, ChangeLogEntry.Op.DELETE)
+
+    job = PurgeJob.objects.create(target=target, object_id=obj.pk, label=str(obj)[:140], requested_by=requested_by)
+    transaction.on_commit(partial(start, job.pk))
+    return job
+
+
+def start(job_id: int) -> None:
+    threading.Thread(target=run, args=(job_id,), name=f"purge-{job_id}", daemon=True).start()
+
+
+def run(job_id: int) -> None:
+    """Executa um job até o fim (ou até falhar); seguro para retomar."""
+    try:
+        _run(job_id)
+    finally:
+        # A thread abriu a sua própria conexão.
+        connections.close_all()
+
+
+def _related(obj):
+    """Querysets das linhas que caem em cascata com o objeto."""
+    for rel in obj._meta.related_objects:
+        if rel.many_to_many or rel.on_delete is not models.CASCADE:
+            continue
+        yield rel.related_model._base_manager.filter(**{rel.field.name: obj})
+
+
+def _run(job_id: int) -> None:
+    job = PurgeJob.objects.get(pk=job_id)
+    if job.status == PurgeJob.Status.DONE:
+        return
+    obj = _MODELS[job.target].all_objects.filter(pk=job.object_id).first()
+    querysets = list(_related(obj)) if obj else []
+
+    job.status = PurgeJob.Status.RUNNING
+    job.started_at = job.started_at or timezone.now()
+    if not job.total_rows:
+        job.total_rows = sum(qs.count() for qs in querysets) + 1
+    job.save(update_fields=["status", "started_at", "total_rows"])
+
+    try:
+        with signals.suspended():
+            for qs in querysets:
+                while ids := list(qs.values_list("pk", flat=True)[:BATCH_SIZE]):
+                    with transaction.atomic():
+                        qs.model._base_manager.filter(pk__in=ids).delete()
+                        PurgeJob.objects.filter(pk=job_id).update(deleted_rows=F("deleted_rows") + len(ids))
+                    time.sleep(PAUSE_SECONDS)
+            if obj:
+                obj.delete()
+    except Exception:
+        PurgeJob.objects.filter(pk=job_id).update(status=PurgeJob.Status.FAILED, error=traceback.format_exc())
+        return
+
+    PurgeJob.objects.filter(pk=job_id).update(
+        status=PurgeJob.Status.DONE, deleted_rows=F("total_rows"), finished_at=timezone.now(), error="",
+    )
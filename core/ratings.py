@@ -0,0 +1,160 @@
+"""
+Rating Elo multijogador por grupo.
+
+Cada partida vira um conjunto de confrontos dois a dois: quem terminou com
+saldo maior vence o confronto, saldos iguais empatam. Partidas novas só
+reprocessam a própria data; edições em partidas antigas reprocessam a partir
+da data editada, restaurando o estado anterior do histórico guardado.
+"""
+import datetime
+from decimal import Decimal
+
+import numpy as np
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Max, Value
+from django.db.models.functions import Coalesce
+
+from .models import GameParticipation, PlayerRating, PlayerYearlyStat
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+
+# (dia ordinal, rating): 8 bytes por partida jogada
+HISTORY_DTYPE = np.dtype([("day", "<i4"), ("rating", "<f4")])
+
+_MONEY = models.DecimalField(max_digits=12, decimal_places=2)
+_NET = ExpressionWrapper(
+    F("final_balance") - F("game__buy_in") - Coalesce("rebuy", Value(Decimal("0")), output_field=_MONEY),
+    output_field=_MONEY,
+)
+
+
+def decode_history(blob) -> np.ndarray:
+    return np.frombuffer(bytes(blob or b""), dtype=HISTORY_DTYPE)
+
+
+def history_points(rating: PlayerRating):
+    """Lista de (data, rating) pronta para gráficos."""
+    return [
+        (datetime.date.fromordinal(int(day)), round(float(value), 1))
+        for day, value in decode_history(rating.history)
+    ]
+
+
+def _load_results(group_id: int, since: datetime.date | None):
+    """Resultados do grupo em arrays colunares, na ordem cronológica das partidas."""
+    qs = GameParticipation.objects.filter(game__posts__group_id=group_id)
+    if since:
+        qs = qs.filter(game__date__gte=since)
+    rows = list(
+        qs.annotate(net=_NET)
+        .order_by("game__date", "game__created_at", "game_id")
+        .values_list("game_id", "game__date", "player_id", "net")
+    )
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.astype(np.int32), empty, empty.astype(np.float64)
+    game_ids, days, players, nets = zip(*rows)
+    return (
+        np.asarray(game_ids, dtype=np.int64),
+        np.fromiter((d.toordinal() for d in days), dtype=np.int32, count=len(days)),
+        np.asarray(players, dtype=np.int64),
+        np.asarray(nets, dtype=np.float64),
+    )
+
+
+def _replay(ratings: np.ndarray, idx: np.ndarray, nets: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """
+    Aplica as partidas em ordem sobre 'ratings' (modificado in-place).
+    Retorna o rating de cada participação logo após a sua partida.
+    """
+    after = np.empty(len(idx), dtype=np.float64)
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        p = idx[start:end]
+        r = ratings[p]
+        n = end - start
+        if n > 1:
+            g = nets[start:end]
+            score = (np.sign(g[:, None] - g[None, :]) + 1) / 2
+            expected = 1 / (1 + 10 ** ((r[None, :] - r[:, None]) / 400))
+            r = r + K_FACTOR / (n - 1) * (score - expected).sum(axis=1)
+            ratings[p] = r
+        after[start:end] = r
+    return after
+
+
+@transaction.atomic
+def replay_from(group_id: int, since: datetime.date | None = None) -> int:
+    """
+    Recalcula os ratings do grupo a partir de 'since' (ou do zero, se None).
+    Retorna o número de participações reprocessadas.
+    """
+    # Anos arquivados (core/archive.py) não estão mais nas tabelas: o histórico
+    # até lá é mantido e o replay começa depois deles.
+    archived = PlayerYearlyStat.objects.filter(group_id=group_id).aggregate(year=Max("year"))["year"]
+    if archived is not None:
+        floor = datetime.date(archived + 1, 1, 1)
+        since = max(since, floor) if since else floor
+
+    existing = {r.player_id: r for r in PlayerRating.objects.filter(group_id=group_id)}
+    game_ids, days, players, nets = _load_results(group_id, since)
+
+    player_ids = np.unique(np.concatenate([np.fromiter(existing, dtype=np.int64), players]))
+    ratings = np.full(len(player_ids), INITIAL_RATING)
+    cutoff = since.toordinal() if since else None
+
+    prefixes, truncated = {}, set()
+    for pid, obj in existing.items():
+        full = decode_history(obj.history)
+        hist = full[full["day"] < cutoff] if cutoff is not None else full[:0]
+        prefixes[pid] = hist
+        if len(hist) != len(full):
+            truncated.add(pid)
+        if len(hist):
+            ratings[np.searchsorted(player_ids, pid)] = hist["rating"][-1]
+
+    idx = np.searchsorted(player_ids, players)
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(game_ids)) + 1, [len(game_ids)]))
+    after = _replay(ratings, idx, nets, bounds)
+
+    entries = np.empty(len(idx), dtype=HISTORY_DTYPE)
+    entries["day"] = days
+    entries["rating"] = after
+    order = np.argsort(idx, kind="stable")
+    split_at = np.flatnonzero(np.diff(idx[order])) + 1
+    appended = {
+        int(player_ids[idx[chunk[0]]]): entries[chunk]
+        for chunk in np.split(order, split_at) if len(chunk)
+    }
+
+    to_create, to_update, to_delete = [], [], []
+    for pid in player_ids.tolist():
+        if pid not in appended and pid not in truncated:
+            continue
+        parts = [h for h in (prefixes.get(pid), appended.get(pid)) if h is not None]
+        hist = np.concatenate(parts) if parts else np.empty(0, dtype=HISTORY_DTYPE)
+        obj = existing.get(pid)
+        if not len(hist):
+            if obj:
+                to_delete.append(obj.pk)
+            continue
+        if obj is None:
+            obj = PlayerRating(group_id=group_id, player_id=pid)
+            to_create.append(obj)
+        else:
+            to_update.append(obj)
+        obj.rating = float(hist["rating"][-1])
+        obj.games = len(hist)
+        obj.last_date = datetime.date.fromordinal(int(hist["day"][-1]))
+        obj.history = hist.tobytes()
+
+    if to_delete:
+        PlayerRating.objects.filter(pk__in=to_delete).delete()
+    PlayerRating.objects.bulk_update(to_update, ["rating", "games", "last_date", "history"], batch_size=500)
+    PlayerRating.objects.bulk_create(to_create, batch_size=500)
+    return len(idx)
+
+
+def replay_groups(group_ids, since: datetime.date | None) -> None:
+    for group_id in set(group_ids):
+        replay_from(group_id, since)
@@ -0,0 +1,154 @@
+"""
+Rollups mensais por (grupo, jogador, mês).
+
+As escritas de participação recalculam apenas os buckets afetados; consultas
+de ranking ("este mês", "esta temporada", "geral") somam poucas linhas de
+PlayerMonthlyStat em vez de varrer todas as participações do grupo.
+"""
+import datetime
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Count, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from .models import GameParticipation, GamePost, PlayerMonthlyStat, PlayerYearlyStat
+
+_MONEY = models.DecimalField(max_digits=12, decimal_places=2)
+_REBUY = Coalesce("rebuy", Value(Decimal("0")), output_field=_MONEY)
+_INVESTED = ExpressionWrapper(F("game__buy_in") + _REBUY, output_field=_MONEY)
+
+PERIODS = {
+    "month": "Este mês",
+    "season": "Esta temporada",
+    "all": "Geral",
+}
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def next_month(day: datetime.date) -> datetime.date:
+    day = month_start(day)
+    return day.replace(year=day.year + 1, month=1) if day.month == 12 else day.replace(month=day.month + 1)
+
+
+def period_bounds(period: str, today: datetime.date | None = None):
+    """
+    Intervalo [início, fim) de meses para um período de ranking.
+    A temporada é o ano corrente; 'all' não tem limites.
+    """
+    today = today or timezone.localdate()
+    if period == "month":
+        return month_start(today), next_month(today)
+    if period == "season":
+        return today.replace(month=1, day=1), today.replace(year=today.year + 1, month=1, day=1)
+    return None, None
+
+
+def _aggregate(qs):
+    return qs.annotate(
+        games=Count("id"),
+        wins=Count("id", filter=Q(final_balance__gt=_INVESTED)),
+        invested=Sum(_INVESTED),
+        final_total=Sum("final_balance"),
+        rebuy_total=Sum(_REBUY),
+    )
+
+
+def _to_stat(group_id, month, row):
+    invested = row["invested"] or Decimal("0")
+    final_total = row["final_total"] or Decimal("0")
+    return PlayerMonthlyStat(
+        group_id=group_id,
+        player_id=row["player_id"],
+        month=month,
+        games=row["games"],
+        wins=row["wins"],
+        invested=invested,
+        final_total=final_total,
+        rebuy=row["rebuy_total"] or Decimal("0"),
+        net=final_total - invested,
+    )
+
+
+@transaction.atomic
+def refresh_bucket(group_id: int, month: datetime.date, player_ids=None) -> None:
+    """
+    Recalcula o rollup de (grupo, mês) para os jogadores informados
+    (ou para todos, se player_ids for None).
+    """
+    start, end = month_start(month), next_month(month)
+    parts = GameParticipation.objects.filter(
+        game__posts__group_id=group_id, game__date__gte=start, game__date__lt=end,
+    )
+    stale = PlayerMonthlyStat.objects.filter(group_id=group_id, month=start)
+    if player_ids is not None:
+        player_ids = list(player_ids)
+        parts = parts.filter(player_id__in=player_ids)
+        stale = stale.filter(player_id__in=player_ids)
+
+    rows = _aggregate(parts.values("player_id"))
+    stale.delete()
+    PlayerMonthlyStat.objects.bulk_create([_to_stat(group_id, start, row) for row in rows])
+
+
+def refresh_buckets(keys, player_ids=None) -> None:
+    """Recalcula um conjunto de buckets (group_id, mês), sem repetir."""
+    for group_id, month in {(g, month_start(m)) for g, m in keys}:
+        refresh_bucket(group_id, month, player_ids)
+
+
+def game_buckets(game_id: int, day: datetime.date):
+    """Buckets (group_id, mês) afetados por uma partida postada em vários grupos."""
+    group_ids = GamePost.objects.filter(game_id=game_id).values_list("group_id", flat=True)
+    return [(gid, month_start(day)) for gid in group_ids]
+
+
+@transaction.atomic
+def rebuild_group(group_id: int) -> int:
+    """Reconstrói todos os rollups de um grupo em uma consulta agregada."""
+    rows = _aggregate(
+        GameParticipation.objects
+        .filter(game__posts__group_id=group_id)
+        .annotate(month=TruncMonth("game__date"))
+        .values("player_id", "month")
+    )
+    stats = [_to_stat(group_id, row["month"], row) for row in rows]
+    PlayerMonthlyStat.objects.filter(group_id=group_id).delete()
+    PlayerMonthlyStat.objects.bulk_create(stats)
+    return len(stats)
+
+
+def standings(group_id: int, start: datetime.date | None = None, end: datetime.date | None = None):
+    """
+    Ranking do grupo no intervalo de meses [start, end), ordenado pelo saldo.
+    Anos inteiros dentro do intervalo também somam as partidas arquivadas
+    (PlayerYearlyStat, ver core/archive.py).
+    """
+    qs = PlayerMonthlyStat.objects.filter(group_id=group_id)
+    yearly = PlayerYearlyStat.objects.filter(group_id=group_id)
+    if start:
+        qs = qs.filter(month__gte=start)
+        yearly = yearly.filter(year__gte=start.year if (start.month, start.day) == (1, 1) else start.year + 1)
+    if end:
+        qs = qs.filter(month__lt=end)
+        yearly = yearly.filter(year__lt=end.year)
+
+    totals = {}
+    for source in (qs, yearly):
+        rows = source.values("player_id", "player__username").annotate(
+            games=Sum("games"),
+            wins=Sum("wins"),
+            invested=Sum("invested"),
+            rebuy=Sum("rebuy"),
+            net=Sum("net"),
+        )
+        for row in rows:
+            total = totals.setdefault(row["player_id"], row)
+            if total is not row:
+                for field in ("games", "wins", "invested", "rebuy", "net"):
+                    total[field] += row[field]
+    return sorted(totals.values(), key=lambda row: (-row["net"], row["player__username"]))
@@ -6,8 +6,8 @@ User = get_user_model()
 
 
 @transaction.atomic
-def create_group_with_admin(*, name: str, created_by: User, description: str = "") -> Group:
-    group = Group.objects.create(name=name, description=description, created_by=created_by)
+def create_group_with_admin(*, name: str, created_by: User, description: str = "", image=None) -> Group:
+    group = Group.objects.create(name=name, description=description, created_by=created_by, image=image)
     GroupMembership.objects.create(user=created_by, group=group, role=GroupMembership.Role.ADMIN)
     return group
 
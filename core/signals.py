@@ -0,0 +1,205 @@
+"""
+Receivers que mantêm os dados derivados (rollups, ratings, feed, modo ao
+vivo, change log e histórico de alterações) em dia a partir das escritas em
+Game, GamePost, GameParticipation e GroupMembership.
+"""
+import threading
+from contextlib import contextmanager
+from functools import partial, wraps
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import audit, changelog, feed, live, rollups, thumbnails
+from .models import AuditEntry, ChangeLogEntry, FeedEntry, Game, GameParticipation, GamePost, Group, GroupMembership
+
+
+_local = threading.local()
+
+
+@contextmanager
+def suspended():
+    """
+    Desliga os receivers abaixo na thread atual. Usado pelo purge em lotes,
+    que já atualizou os dados derivados ao esconder o objeto.
+    """
+    previous = getattr(_local, "suspended", False)
+    _local.suspended = True
+    try:
+        yield
+    finally:
+        _local.suspended = previous
+
+
+def _unless_suspended(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, "suspended", False):
+            return None
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _deleting_group(origin) -> bool:
+    """O delete veio em cascata da remoção de um grupo?"""
+    return isinstance(origin, Group) or (isinstance(origin, QuerySet) and origin.model is Group)
+
+
+def _participation_players(game_id):
+    return list(GameParticipation.objects.filter(game_id=game_id).values_list("player_id", flat=True))
+
+
+def _results_changed(buckets, player_ids, since):
+    """Atualiza rollups dos buckets afetados e reprocessa os ratings desde 'since'."""
+    from . import ratings  # NumPy só é carregado na primeira escrita de resultado
+
+    rollups.refresh_buckets(buckets, player_ids)
+    ratings.replay_groups([group_id for group_id, _ in buckets], since)
+
+
+@receiver(post_save, sender=GameParticipation)
+@receiver(post_delete, sender=GameParticipation)
+@_unless_suspended
+def participation_changed(sender, instance, **kwargs):
+    game = Game.objects.only("id", "date").filter(pk=instance.game_id).first()
+    if game is None:
+        return
+    player_ids = {instance.player_id}
+    old_player = instance.loaded_value("player_id")
+    if old_player:
+        player_ids.add(old_player)
+    _results_changed(rollups.game_buckets(game.pk, game.date), player_ids, game.date)
+
+
+@receiver(post_save, sender=Game)
+@_unless_suspended
+def game_saved(sender, instance, created, **kwargs):
+    old_date = instance.loaded_value("date")
+    if created or old_date is None or old_date == instance.date:
+        return
+    players = _participation_players(instance.pk)
+    if not players:
+        return
+    buckets = rollups.game_buckets(instance.pk, old_date) + rollups.game_buckets(instance.pk, instance.date)
+    _results_changed(buckets, players, min(old_date, instance.date))
+
+
+@receiver(pre_delete, sender=Game)
+@_unless_suspended
+def game_deleting(sender, instance, **kwargs):
+    # Os GamePosts somem no cascade; guardamos os buckets antes.
+    instance._rollup_buckets = rollups.game_buckets(instance.pk, instance.date)
+    instance._rollup_players = _participation_players(instance.pk)
+
+
+@receiver(post_delete, sender=Game)
+@_unless_suspended
+def game_deleted(sender, instance, **kwargs):
+    players = getattr(instance, "_rollup_players", None)
+    if players:
+        _results_changed(instance._rollup_buckets, players, instance.date)
+
+
+@receiver(post_save, sender=GamePost)
+@receiver(post_delete, sender=GamePost)
+@_unless_suspended
+def game_post_changed(sender, instance, **kwargs):
+    game = Game.objects.only("id", "date").filter(pk=instance.game_id).first()
+    if game is None:
+        return
+    players = _participation_players(game.pk)
+    if players:
+        _results_changed([(instance.group_id, game.date)], players, game.date)
+
+
+@receiver(post_save, sender=GamePost)
+@_unless_suspended
+def game_post_published(sender, instance, created, **kwargs):
+    if created:
+        feed.publish_to_group(
+            FeedEntry.Kind.GAME_POSTED, instance.group_id, actor=instance.posted_by_id, game=instance.game_id,
+        )
+
+
+@receiver(post_save, sender=GameParticipation)
+@_unless_suspended
+def participation_result_published(sender, instance, created, **kwargs):
+    changed = created or any(
+        instance.loaded_value(f) != getattr(instance, f) for f in ("final_balance", "rebuy", "player_id")
+    )
+    if changed:
+        feed.publish(FeedEntry.Kind.RESULT, [instance.player_id], game=instance.game_id)
+
+
+@receiver(post_save, sender=GameParticipation)
+@receiver(post_delete, sender=GameParticipation)
+@receiver(post_save, sender=Game)
+@_unless_suspended
+def game_live_update(sender, instance, **kwargs):
+    game_id = instance.pk if sender is Game else instance.game_id
+    if live.has_watchers(game_id):
+        transaction.on_commit(partial(live.publish_game, game_id))
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_save, sender=GameParticipation)
+@receiver(post_save, sender=GroupMembership)
+@receiver(post_save, sender=GamePost)
+@_unless_suspended
+def log_saved(sender, instance, created, **kwargs):
+    op = ChangeLogEntry.Op.INSERT if created else ChangeLogEntry.Op.UPDATE
+    group_ids = changelog.groups_for(instance)
+    if sender is GamePost and created:
+        # A partida passa a existir para o grupo junto com a postagem.
+        changelog.record(group_ids, instance.game, ChangeLogEntry.Op.INSERT)
+    changelog.record(group_ids, instance, op)
+
+
+@receiver(pre_delete, sender=Game)
+@receiver(pre_delete, sender=GameParticipation)
+@_unless_suspended
+def log_deleting(sender, instance, **kwargs):
+    # Depois do delete não dá mais para descobrir os grupos da partida.
+    instance._changelog_groups = changelog.groups_for(instance)
+
+
+@receiver(post_delete, sender=Game)
+@receiver(post_delete, sender=GameParticipation)
+@receiver(post_delete, sender=GroupMembership)
+@receiver(post_delete, sender=GamePost)
+@_unless_suspended
+def log_deleted(sender, instance, origin=None, **kwargs):
+    if _deleting_group(origin):
+        return  # o log do grupo vai junto no cascade
+    group_ids = getattr(instance, "_changelog_groups", None)
+    if group_ids is None:
+        group_ids = changelog.groups_for(instance)
+    changelog.record(group_ids, instance, ChangeLogEntry.Op.DELETE)
+
+
+@receiver(post_save, sender=Game)
+@receiver(post_save, sender=GameParticipation)
+@_unless_suspended
+def audit_saved(sender, instance, created, **kwargs):
+    audit.record(instance, AuditEntry.Action.CREATE if created else AuditEntry.Action.UPDATE)
+
+
+@receiver(post_delete, sender=Game)
+@receiver(post_delete, sender=GameParticipation)
+@_unless_suspended
+def audit_deleted(sender, instance, origin=None, **kwargs):
+    if sender is Game:
+        audit.record(instance, AuditEntry.Action.DELETE, game_deleted=True)
+    # Participações só em remoções diretas: no cascade de uma partida fica a
+    # entrada da própria partida.
+    elif isinstance(origin, GameParticipation) or (isinstance(origin, QuerySet) and origin.model is GameParticipation):
+        audit.record(instance, AuditEntry.Action.DELETE)
+
+
+@receiver(post_save, sender=Group)
+@_unless_suspended
+def group_image_changed(sender, instance, **kwargs):
+    if not thumbnails.is_current(instance):
+        thumbnails.schedule(instance.pk)
@@ -0,0 +1,59 @@
+// Modo ao vivo da partida: recebe snapshots por SSE (ou long-poll) e
+// atualiza saldos, rebuys e o total sem recarregar a página.
+(function () {
+  const root = document.getElementById("live-game");
+  if (!root) return;
+
+  let version = parseInt(root.dataset.version || "0", 10);
+
+  function apply(message) {
+    if (!message || message.version <= version) return;
+    version = message.version;
+
+    const rows = document.querySelectorAll("[data-participation]");
+    const known = Array.from(rows, (row) => row.dataset.participation).sort().join(",");
+    const incoming = message.participations.map((p) => String(p.id)).sort().join(",");
+    if (known !== incoming) {
+      // Entrou ou saiu alguém: a lista muda de forma, recarrega.
+      window.location.reload();
+      return;
+    }
+
+    const buyIn = parseFloat(message.buy_in);
+    message.participations.forEach((p) => {
+      const row = document.querySelector(`[data-participation="${p.id}"]`);
+      const amount = row.querySelector('[data-field="final_balance"]');
+      const rebuy = row.querySelector('[data-field="rebuy"]');
+      const invested = buyIn + parseFloat(p.rebuy);
+      const balance = parseFloat(p.final_balance);
+      amount.textContent = `R$ ${p.final_balance}`;
+      amount.classList.remove("amount-win", "amount-loss", "amount-even");
+      amount.classList.add(balance > invested ? "amount-win" : balance < invested ? "amount-loss" : "amount-even");
+      if (rebuy) rebuy.textContent = p.rebuy;
+    });
+    const pot = document.querySelector('[data-live="total-pot"]');
+    if (pot) pot.textContent = message.total_pot;
+  }
+
+  function poll() {
+    fetch(`${root.dataset.pollUrl}?since=${version}`, { credentials: "same-origin" })
+      .then((r) => {
+        // 200: nova versão; 204: a espera terminou sem mudanças. O resto
+        // (sem permissão, servidor sem ASGI) encerra o modo ao vivo.
+        if (r.status === 200) return r.json().then((message) => { apply(message); poll(); });
+        if (r.status === 204) poll();
+      })
+      .catch(() => setTimeout(poll, 5000));
+  }
+
+  if (window.EventSource) {
+    const source = new EventSource(`${root.dataset.streamUrl}?since=${version}`);
+    source.addEventListener("participations", (e) => apply(JSON.parse(e.data)));
+    source.onerror = () => {
+      // Stream encerrado pelo servidor: tenta o long-poll.
+      if (source.readyState === EventSource.CLOSED) poll();
+    };
+  } else {
+    poll();
+  }
+})();
@@ -0,0 +1,49 @@
+"""
+Storage de arquivos estáticos: nomes com hash (ManifestStaticFilesStorage) e,
+no próprio collectstatic, variantes .gz e .br pré-comprimidas para o
+StaticFilesMiddleware servir conforme o Accept-Encoding.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # opcional: sem o pacote, só gera .gz
+    brotli = None
+
+COMPRESSIBLE = (".css", ".js", ".svg", ".html", ".json", ".txt", ".map", ".ico", ".xml")
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0: a mesma entrada gera sempre o mesmo arquivo.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        # O manifest faz várias passadas e repete nomes; comprime cada um uma vez,
+        # depois que o conteúdo final (com as URLs reescritas) está em disco.
+        hashed = {}
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if isinstance(hashed_name, str):
+                hashed[name] = hashed_name
+            yield name, hashed_name, processed
+        if not dry_run:
+            for hashed_name in hashed.values():
+                if hashed_name.endswith(COMPRESSIBLE):
+                    self._write_compressed(hashed_name)
+
+    def _write_compressed(self, name: str) -> None:
+        with self.open(name) as fh:
+            data = fh.read()
+        variants = [(".gz", _gzip)]
+        if brotli is not None:
+            variants.append((".br", lambda d: brotli.compress(d, quality=11)))
+        for suffix, compress in variants:
+            packed = compress(data)
+            # Só vale a pena se ficar menor.
+            if len(packed) < len(data):
+                path = self.path(name + suffix)
+                with open(path, "wb") as out:
+                    out.write(packed)
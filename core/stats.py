@@ -0,0 +1,104 @@
+"""
+Motor de estatísticas em lote.
+
+Carrega as participações de um grupo em arrays colunares (uma consulta) e
+calcula por jogador variância, desvio padrão, maiores sequências de vitórias
+e derrotas, ROI e taxa de rebuy com operações vetorizadas do NumPy.
+"""
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from .models import GameParticipation, PlayerGroupStats
+
+
+def load_columns(group_id: int) -> dict:
+    """Participações do grupo como arrays, ordenadas por jogador e data."""
+    rows = list(
+        GameParticipation.objects
+        .filter(game__posts__group_id=group_id)
+        .values_list("player_id", "game__date", "game_id", "final_balance", "game__buy_in", "rebuy")
+    )
+    n = len(rows)
+    player = np.empty(n, dtype=np.int64)
+    day = np.empty(n, dtype=np.int32)
+    game = np.empty(n, dtype=np.int64)
+    final = np.empty(n, dtype=np.float64)
+    buy_in = np.empty(n, dtype=np.float64)
+    rebuy = np.empty(n, dtype=np.float64)
+    for i, (pid, d, gid, fb, bi, rb) in enumerate(rows):
+        player[i], day[i], game[i] = pid, d.toordinal(), gid
+        final[i], buy_in[i], rebuy[i] = fb, bi, rb or 0
+
+    order = np.lexsort((game, day, player))
+    invested = buy_in + rebuy
+    return {
+        "player": player[order],
+        "day": day[order],
+        "net": (final - invested)[order],
+        "rebuy": rebuy[order],
+        "invested": invested[order],
+    }
+
+
+def compute(columns: dict) -> list[dict]:
+    """Estatísticas por jogador a partir das colunas de load_columns()."""
+    player, net = columns["player"], columns["net"]
+    n = len(player)
+    if not n:
+        return []
+
+    players, starts, counts = np.unique(player, return_index=True, return_counts=True)
+    seg = np.repeat(np.arange(len(players)), counts)
+
+    total = np.add.reduceat(net, starts)
+    mean = total / counts
+    variance = np.add.reduceat(net ** 2, starts) / counts - mean ** 2
+    variance = np.clip(variance, 0, None)
+    invested = np.add.reduceat(columns["invested"], starts)
+    roi = np.divide(total, invested, out=np.zeros_like(total), where=invested > 0)
+    rebuy_rate = np.add.reduceat((columns["rebuy"] > 0).astype(np.float64), starts) / counts
+
+    # Sequências: quebra em runs de mesmo resultado dentro de cada jogador.
+    outcome = np.sign(net)
+    change = np.ones(n, dtype=bool)
+    change[1:] = (outcome[1:] != outcome[:-1]) | (seg[1:] != seg[:-1])
+    run_starts = np.flatnonzero(change)
+    run_lens = np.diff(np.append(run_starts, n))
+    run_outcome, run_seg = outcome[run_starts], seg[run_starts]
+    wins = np.zeros(len(players), dtype=np.int64)
+    losses = np.zeros(len(players), dtype=np.int64)
+    np.maximum.at(wins, run_seg[run_outcome > 0], run_lens[run_outcome > 0])
+    np.maximum.at(losses, run_seg[run_outcome < 0], run_lens[run_outcome < 0])
+
+    return [
+        {
+            "player_id": int(players[i]),
+            "games": int(counts[i]),
+            "total_net": float(total[i]),
+            "mean_net": float(mean[i]),
+            "variance": float(variance[i]),
+            "stddev": float(np.sqrt(variance[i])),
+            "longest_win_streak": int(wins[i]),
+            "longest_loss_streak": int(losses[i]),
+            "roi": float(roi[i]),
+            "rebuy_rate": float(rebuy_rate[i]),
+        }
+        for i in range(len(players))
+    ]
+
+
+def compute_group(group_id: int):
+    """Unidade de trabalho do pool: (group_id, linhas calculadas, participações lidas)."""
+    columns = load_columns(group_id)
+    return group_id, compute(columns), len(columns["player"])
+
+
+@transaction.atomic
+def persist(group_id: int, rows: list[dict]) -> None:
+    now = timezone.now()
+    PlayerGroupStats.objects.filter(group_id=group_id).delete()
+    PlayerGroupStats.objects.bulk_create(
+        [PlayerGroupStats(group_id=group_id, computed_at=now, **row) for row in rows],
+        batch_size=500,
+    )
@@ -0,0 +1,124 @@
+"""
+Miniaturas das fotos de grupo.
+
+O upload só grava o original; um worker em segundo plano (uma thread por
+processo) gera as variantes de tamanho fixo em WebP e JPEG e registra os
+nomes em Group.thumbnails. O campo guarda a imagem de origem, então uma
+variante já gerada nunca é refeita, e as páginas só usam as miniaturas.
+"""
+import hashlib
+import io
+import logging
+import queue
+import threading
+from functools import partial
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import Q
+
+from .models import Group
+
+THUMBNAIL_DIR = "groups/thumbs"
+SIZES = {"sm": 64, "md": 256}
+FORMATS = {
+    # formato: (extensão, formato do Pillow, parâmetros de encode)
+    "webp": ("webp", "WEBP", {"quality": 80, "method": 6}),
+    "jpeg": ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+logger = logging.getLogger(__name__)
+
+_queue: "queue.Queue[int]" = queue.Queue()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def is_current(group) -> bool:
+    """As miniaturas gravadas correspondem à imagem atual do grupo?"""
+    return (group.thumbnails or {}).get("source", "") == (group.image.name or "")
+
+
+def schedule(group_id: int) -> None:
+    """Gera as miniaturas depois do commit, fora da thread da requisição."""
+    transaction.on_commit(partial(_enqueue, group_id))
+
+
+def _enqueue(group_id: int) -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_work, name="thumbnails", daemon=True)
+            _worker.start()
+    _queue.put(group_id)
+
+
+def _work() -> None:
+    while True:
+        group_id = _queue.get()
+        try:
+            build(group_id)
+        except Exception:
+            # Imagem inválida ou storage indisponível: o grupo fica sem
+            # miniatura (Group.thumbnails não muda, então continua pendente)
+            # e o build_thumbnails pode tentar de novo.
+            logger.exception("Falha ao gerar as miniaturas do grupo %s", group_id)
+        finally:
+            connections.close_all()
+            _queue.task_done()
+
+
+def _render(image, box: int, pil_format: str, params: dict) -> bytes:
+    from PIL import Image, ImageOps
+
+    thumb = ImageOps.fit(image, (box, box), Image.LANCZOS)
+    buffer = io.BytesIO()
+    thumb.save(buffer, pil_format, **params)
+    return buffer.getvalue()
+
+
+def build(group_id: int, force: bool = False) -> bool:
+    """Gera (ou remove) as miniaturas do grupo. Retorna False se nada mudou."""
+    group = Group.all_objects.filter(pk=group_id).only("id", "image", "thumbnails").first()
+    if group is None or (is_current(group) and not force):
+        return False
+
+    source = group.image.name or ""
+    result = {"source": source, "variants": {}}
+    if source:
+        # Pillow só é carregado aqui, no worker.
+        from PIL import Image, ImageOps, features
+
+        formats = {k: v for k, v in FORMATS.items() if k != "webp" or features.check("webp")}
+        with group.image.open("rb") as fh:
+            data = fh.read()
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        with Image.open(io.BytesIO(data)) as original:
+            image = ImageOps.exif_transpose(original).convert("RGB")
+            for size, box in SIZES.items():
+                variant = {"width": box, "height": box}
+                for key, (ext, pil_format, params) in formats.items():
+                    # O hash no nome permite servir com cache imutável.
+                    name = f"{THUMBNAIL_DIR}/{group_id}-{size}.{digest}.{ext}"
+                    if default_storage.exists(name):
+                        default_storage.delete(name)
+                    variant[key] = default_storage.save(name, ContentFile(_render(image, box, pil_format, params)))
+                result["variants"][size] = variant
+
+    # Só grava se a imagem não foi trocada enquanto processávamos.
+    same_source = Q(image=source) if source else Q(image="") | Q(image__isnull=True)
+    updated = Group.all_objects.filter(same_source, pk=group_id).update(thumbnails=result)
+    stale = _files(group.thumbnails) - _files(result) if updated else _files(result)
+    for name in stale:
+        default_storage.delete(name)
+    return bool(updated)
+
+
+def _files(thumbnails) -> set[str]:
+    return {
+        name
+        for variant in (thumbnails or {}).get("variants", {}).values()
+        for key, name in variant.items()
+        if key in FORMATS
+    }
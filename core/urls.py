@@ -1,10 +1,10 @@
 from django.urls import path
-from . import views
+from . import api, views
 from django.contrib.auth.views import LogoutView
 app_name = 'core'
 
 urlpatterns = [
-    path('', views.group_list_view, name='group_list'),
+    path('', views.dashboard_view, name='dashboard'),
     path("account/signup/", views.signup_view, name="signup"),
     path("account/login/", views.RememberMeLoginView.as_view(), name="login"),
     path("account/password/reset/", views.PasswordResetView.as_view(), name="password_reset"),
@@ -12,8 +12,11 @@ urlpatterns = [
     path("account/password/reset/<uidb64>/<token>/", views.PasswordResetConfirmView.as_view(), name="password_reset_confirm"),
     path("account/password/reset/done/", views.PasswordResetCompleteView.as_view(), name="password_reset_complete"),
     path("account/logout/", views.logout_view, name="logout"),
+    path('feed/', views.feed_view, name='feed'),
     path('groups/', views.group_list_view, name='group_list'),
     path("groups/<slug:slug>/", views.group_detail_view, name="group_detail"),
+    path("groups/<slug:slug>/standings/", views.group_standings_view, name="group_standings"),
+    path("groups/<slug:slug>/ratings.json", views.group_ratings_view, name="group_ratings"),
     path("groups/<slug:slug>/join-request/", views.group_join_request_view, name="group_join_request"),
     path("groups/<slug:slug>/create-join-request/", views.group_create_join_request_view, name="group_create_join_request"),
     path("groups/<slug:slug>/edit/", views.group_edit_view, name="group_edit"),
@@ -21,16 +24,26 @@ urlpatterns = [
     path("groups/<slug:slug>/delete/", views.group_delete_view, name="group_delete"),
     path("groups/<slug:slug>/accept-request<int:request_id>/", views.group_accept_request_view, name="group_approve_request"),
     path("groups/<slug:slug>/reject-request<int:request_id>/", views.group_reject_request_view, name="group_reject_request"),
+    path("groups/<slug:slug>/requests/bulk/", views.group_bulk_requests_view, name="group_bulk_requests"),
     path("groups/<slug:slug>/promote/<int:user_id>/", views.group_promote_member_view, name="group_promote_member"),
     path("groups/<slug:slug>/demote/<int:user_id>/", views.group_demote_admin_view, name="group_demote_admin"),
     path("groups/<slug:slug>/remove/<int:user_id>/", views.group_remove_member_view, name="group_remove_member"),
     path('create/group', views.group_create_view, name='group_create'),
     path('create/game', views.game_create_view, name='game_create'),
     path('games/<int:pk>/', views.game_detail_view, name='game_detail'),
+    path('games/<int:pk>/live/stream/', views.game_live_stream_view, name='game_live_stream'),
+    path('games/<int:pk>/live/poll/', views.game_live_poll_view, name='game_live_poll'),
     path('games/<int:pk>/add-player/', views.participation_add_view, name='participation_add'),
     path("games/<int:pk>/edit/", views.game_edit_view, name="game_edit"),
     path("games/<int:pk>/delete/", views.game_delete_view, name="game_delete"),
+    path("games/<int:pk>/history/", views.game_history_view, name="game_history"),
     path("games/<int:pk>/participations/<int:part_id>/edit/", views.participation_edit_view, name="participation_edit"),
     path("games/<int:pk>/participations/<int:part_id>/delete/", views.participation_delete_view, name="participation_delete"),
-
+    path("api/v1/groups/", api.group_list_view, name="api_group_list"),
+    path("api/v1/groups/<slug:slug>/games/", api.group_games_view, name="api_group_games"),
+    path("api/v1/groups/<slug:slug>/standings/", api.group_standings_view, name="api_group_standings"),
+    path("api/v1/groups/<slug:slug>/changes/", api.group_changes_view, name="api_group_changes"),
+    path("api/v1/games/<int:pk>/", api.game_detail_view, name="api_game_detail"),
+    path("api/v1/me/results/", api.my_results_view, name="api_my_results"),
+    path("api/v1/me/totals/", api.my_totals_view, name="api_my_totals"),
 ]
@@ -1,20 +1,31 @@
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import login, logout
+from django.core.handlers.asgi import ASGIRequest
 from django.contrib.auth.views import LoginView
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.contrib import messages
 from django.db import IntegrityError, models, transaction
-from django.db.models import Case, When, Value, IntegerField
+from django.db.models import Case, When, Value, IntegerField, OuterRef, Subquery
 from django.forms import model_to_dict
-from django.http import HttpResponseRedirect, Http404
+from django.http import HttpResponse, HttpResponseRedirect, Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render, redirect
+from django.middleware.csrf import get_token
 from django.urls import reverse
+from django.utils.crypto import salted_hmac
+from django.utils.html import format_html
 from django.urls import reverse_lazy
 from django.views.generic import DetailView
 from .forms import GameForm, GameParticipationForm, LoginForm, SignUpForm, GroupForm
-from .models import Group, GroupMembership, Game, GamePost, GameParticipation, GroupRequest
+from .models import ArchivedGame, ChangeLogEntry, FeedEntry, Group, GroupMembership, Game, GamePost, GameParticipation, GroupRequest
 from .services import create_group_with_admin
+from . import audit, changelog, crossgroup, feed, live, purge, rollups
+from .idempotency import idempotent
 from django.http import HttpResponseForbidden
 from django.views.decorators.http import require_http_methods
 from django.db.models import Q
@@ -42,6 +53,63 @@ def group_creator_required(view_func):
 
 # =================================================================
 
+@login_required
+def dashboard_view(request):
+    """
+    Página inicial do usuário: partidas recentes e próximas em todos os seus
+    grupos, saldo do mês e geral e pedidos pendentes nos grupos que administra.
+    Montada em um número fixo de consultas, independente da quantidade de grupos.
+    """
+    today = timezone.localdate()
+    admin_group_ids = GroupMembership.objects.filter(
+        user=request.user, group__hidden_at__isnull=True, role=GroupMembership.Role.ADMIN,
+    ).values("group_id")
+    my_games = crossgroup.member_games(request.user.pk)
+    my_participation = GameParticipation.objects.filter(game=OuterRef("pk"), player=request.user)
+
+    recent_games = list(
+        my_games.filter(date__lte=today)
+        .annotate(
+            my_balance=Subquery(my_participation.values("final_balance")[:1]),
+            my_rebuy=Subquery(my_participation.values("rebuy")[:1]),
+        )
+        .order_by("-date", "-created_at")[:10]
+    )
+    for game in recent_games:
+        game.my_net = (
+            None if game.my_balance is None
+            else game.my_balance - game.buy_in - (game.my_rebuy or 0)
+        )
+
+    upcoming_games = my_games.filter(date__gt=today).order_by("date", "created_at")[:5]
+
+    # Cada partida conta uma vez, mesmo postada em vários grupos.
+    month = crossgroup.totals(request.user.pk, rollups.month_start(today), today + datetime.timedelta(days=1))
+    lifetime = crossgroup.totals(request.user.pk)
+
+    pending_requests = (
+        GroupRequest.objects
+        .filter(group_id__in=admin_group_ids)
+        .select_related("group", "requested_by")
+        .order_by("-created_at")[:20]
+    )
+
+    return render(request, "dashboard.html", {
+        "recent_games": recent_games,
+        "upcoming_games": upcoming_games,
+        "month_games": month["games"],
+        "month_net": month["net"],
+        "lifetime": lifetime,
+        "pending_requests": pending_requests,
+    })
+
+@login_required
+def feed_view(request):
+    before = request.GET.get("before")
+    entries = feed.page(request.user, before=int(before) if before and before.isdigit() else None)
+    next_before = entries[-1].pk if len(entries) == feed.PAGE_SIZE else None
+    return render(request, "feed.html", {"entries": entries, "next_before": next_before})
+
 @login_required
 def group_list_view(request):
     q = request.GET.get("q", "")
@@ -67,24 +135,28 @@ def group_list_view(request):
         {"my_groups": my_groups, "other_groups": other_groups},
     )
 
+def _fragment_viewer(request, is_admin: bool) -> str:
+    """
+    Parte da chave dos fragmentos em cache que depende de quem vê a página.
+    Membros comuns compartilham a mesma versão; a de admin traz formulários
+    com {% csrf_token %}, então fica ligada ao segredo CSRF da sessão.
+    """
+    if not is_admin:
+        return "member"
+    get_token(request)
+    return "admin-" + salted_hmac("core.fragment", request.META["CSRF_COOKIE"]).hexdigest()[:16]
+
 @login_required
 def group_detail_view(request, slug):
-    group = (
-        Group.objects
-        .prefetch_related(
-            models.Prefetch(
-                "posts",
-                queryset=GamePost.objects
-                    .select_related("game", "posted_by", "group")
-                    .order_by("-posted_at")
-            )
-        )
-        .select_related("created_by")
-        .get(slug=slug)
-    )
-
-    posts = group.posts.all()
+    group = get_object_or_404(Group.objects.select_related("created_by"), slug=slug)
 
+    # Tudo abaixo é lazy: só é consultado se o fragmento não estiver em cache.
+    posts = (
+        GamePost.objects
+        .filter(group=group)
+        .select_related("game", "posted_by")
+        .order_by("-posted_at")
+    )
     memberships = (
         GroupMembership.objects
         .filter(group=group)
@@ -115,89 +187,162 @@ def group_detail_view(request, slug):
         "is_member": is_member,
         "join_requests": join_requests,
         "recent_posts": posts[:10],
-        "recent_games": [p.game for p in posts[:10]],
-        "total_posts": posts.count(),
+        "total_posts": posts.count,
         "memberships": memberships,
-        "players": [gm.user for gm in memberships],
+        "fragment_viewer": _fragment_viewer(request, is_admin),
     }
     return render(request, "group_detail.html", context)
 
+@login_required
+def group_standings_view(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    if not GroupMembership.objects.filter(group=group, user=request.user).exists():
+        messages.error(request, "Entre no grupo para ver o ranking.")
+        return redirect("core:group_detail", slug=slug)
+
+    period = request.GET.get("period", "month")
+    if period not in rollups.PERIODS:
+        period = "month"
+    start, end = rollups.period_bounds(period)
+
+    return render(request, "group_standings.html", {
+        "group": group,
+        "period": period,
+        "periods": rollups.PERIODS,
+        "standings": rollups.standings(group.pk, start, end),
+    })
+
+@login_required
+def group_ratings_view(request, slug):
+    """
+    Ratings atuais do grupo com o histórico de cada jogador, para gráficos.
+    """
+    group = get_object_or_404(Group, slug=slug)
+    if not GroupMembership.objects.filter(group=group, user=request.user).exists():
+        return HttpResponseForbidden("Você não é membro deste grupo.")
+
+    from . import ratings  # carrega o NumPy só quando alguém pede os ratings
+
+    rows = group.ratings.select_related("player").order_by("-rating")
+    return JsonResponse({
+        "group": group.slug,
+        "ratings": [
+            {
+                "player": r.player.username,
+                "rating": round(r.rating, 1),
+                "games": r.games,
+                "history": [[day.isoformat(), value] for day, value in ratings.history_points(r)],
+            }
+            for r in rows
+        ],
+    })
+
+def _wants_fragment(request) -> bool:
+    return request.headers.get("HX-Request") == "true"
+
+
+def _admin_action_done(request, slug, level, text, fragment=None, context=None):
+    """
+    Resposta das ações de admin do group_detail. Em requisições HTMX devolve
+    só o fragmento alterado (sem mensagem, sem recarregar a página inteira);
+    fora delas, grava a mensagem e redireciona como antes.
+    """
+    if _wants_fragment(request):
+        if fragment is None:
+            # Nada muda no alvo: não troca nada e mostra a mensagem como alerta OOB.
+            response = HttpResponse(format_html(
+                '<div id="messages" hx-swap-oob="beforeend">'
+                '<div class="alert alert-{} mb-2" role="alert">{}</div></div>',
+                messages.DEFAULT_TAGS.get(level, "info"), text,
+            ))
+            response["HX-Reswap"] = "none"
+            return response
+        return render(request, fragment, context)
+    messages.add_message(request, level, text)
+    return redirect("core:group_detail", slug=slug)
+
+
+def _member_row(gm, group):
+    return {"gm": gm, "group": group, "is_admin": True}
+
+
+def _member_count_oob(group):
+    return format_html(
+        '<span id="member-count" class="badge bg-secondary" hx-swap-oob="true">{}</span>',
+        GroupMembership.objects.filter(group=group).count(),
+    )
+
+
 @login_required
 @group_admin_required
 def group_promote_member_view(request, slug, user_id):
     if request.method != "POST":
-        messages.error(request, "Operação inválida.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Operação inválida.")
 
     group = get_object_or_404(Group, slug=slug)
     target_user = get_object_or_404(User, pk=user_id)
 
-    if target_user == group.created_by:
-        messages.info(request, "O criador já possui privilégios máximos.")
-        return redirect("core:group_detail", slug=slug)
-
-    gm = GroupMembership.objects.filter(group=group, user=target_user).first()
+    gm = GroupMembership.objects.filter(group=group, user=target_user).select_related("user").first()
     if not gm:
-        messages.error(request, "Usuário não é membro deste grupo.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Usuário não é membro deste grupo.")
+
+    row = _member_row(gm, group)
+    if target_user == group.created_by:
+        return _admin_action_done(request, slug, messages.INFO, "O criador já possui privilégios máximos.", "includes/member_row.html", row)
 
     if gm.role == GroupMembership.Role.ADMIN:
-        messages.info(request, f"{target_user.username} já é administrador.")
-    else:
-        gm.role = GroupMembership.Role.ADMIN
-        gm.save(update_fields=["role"])
-        messages.success(request, f"{target_user.username} agora é administrador.")
+        return _admin_action_done(request, slug, messages.INFO, f"{target_user.username} já é administrador.", "includes/member_row.html", row)
 
-    return redirect("core:group_detail", slug=slug)
+    gm.role = GroupMembership.Role.ADMIN
+    gm.save(update_fields=["role"])
+    feed.publish(FeedEntry.Kind.PROMOTED, [target_user.pk], actor=request.user, group=group)
+    return _admin_action_done(request, slug, messages.SUCCESS, f"{target_user.username} agora é administrador.", "includes/member_row.html", row)
 
 
 @login_required
 @group_admin_required
 def group_demote_admin_view(request, slug, user_id):
     if request.method != "POST":
-        messages.error(request, "Operação inválida.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Operação inválida.")
 
     group = get_object_or_404(Group, slug=slug)
     target_user = get_object_or_404(User, pk=user_id)
 
     if target_user == group.created_by:
-        messages.error(request, "Você não pode remover privilégios do criador do grupo.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Você não pode remover privilégios do criador do grupo.")
 
-    gm = GroupMembership.objects.filter(group=group, user=target_user).first()
+    gm = GroupMembership.objects.filter(group=group, user=target_user).select_related("user").first()
     if not gm:
-        messages.error(request, "Usuário não é membro deste grupo.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Usuário não é membro deste grupo.")
 
+    row = _member_row(gm, group)
     if gm.role != GroupMembership.Role.ADMIN:
-        messages.info(request, f"{target_user.username} já não é administrador.")
-    else:
-        gm.role = GroupMembership.Role.MEMBER
-        gm.save(update_fields=["role"])
-        messages.success(request, f"Privilégios de administrador removidos de {target_user.username}.")
+        return _admin_action_done(request, slug, messages.INFO, f"{target_user.username} já não é administrador.", "includes/member_row.html", row)
 
-    return redirect("core:group_detail", slug=slug)
+    gm.role = GroupMembership.Role.MEMBER
+    gm.save(update_fields=["role"])
+    feed.publish(FeedEntry.Kind.DEMOTED, [target_user.pk], actor=request.user, group=group)
+    return _admin_action_done(request, slug, messages.SUCCESS, f"Privilégios de administrador removidos de {target_user.username}.", "includes/member_row.html", row)
 
 
 @login_required
 @group_admin_required
 def group_remove_member_view(request, slug, user_id):
     if request.method != "POST":
-        messages.error(request, "Operação inválida.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Operação inválida.")
 
     group = get_object_or_404(Group, slug=slug)
     target_user = get_object_or_404(User, pk=user_id)
 
     if target_user == group.created_by:
-        messages.error(request, "Você não pode remover o criador do grupo.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Você não pode remover o criador do grupo.")
     if target_user == request.user:
-        messages.info(request, "Para sair do grupo, use o botão 'Sair do grupo'.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.INFO, "Para sair do grupo, use o botão 'Sair do grupo'.")
 
     deleted, _ = GroupMembership.objects.filter(group=group, user=target_user).delete()
+    if _wants_fragment(request):
+        # A linha some (outerHTML vazio) e o contador é atualizado fora da área alvo.
+        return HttpResponse(_member_count_oob(group))
     if deleted:
         messages.success(request, f"{target_user.username} foi removido do grupo.")
     else:
@@ -217,6 +362,7 @@ def group_create_view(request):
                     create_group_with_admin(
                         name=form.cleaned_data["name"],
                         description=form.cleaned_data.get("description", ""),
+                        image=form.cleaned_data.get("image"),
                         created_by=request.user,
                     )
             except IntegrityError:
@@ -284,34 +430,101 @@ def group_create_join_request_view(request, slug):
     GroupRequest.objects.create(group=group, requested_by=request.user)
     return redirect("core:group_join_request", slug=slug)
 
+def _join_requests_context(group, **extra):
+    return {
+        "group": group,
+        "is_admin": True,
+        "join_requests": GroupRequest.objects.filter(group=group).select_related("requested_by"),
+        **extra,
+    }
+
+
 @login_required
 @group_admin_required
 def group_accept_request_view(request, slug, request_id):
     if request.method != "POST":
-        messages.error(request, "Operação inválida.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Operação inválida.")
 
     group = get_object_or_404(Group, slug=slug)
-    join_request = get_object_or_404(GroupRequest, id=request_id, group=group)
+    join_request = get_object_or_404(GroupRequest.objects.select_related("requested_by"), id=request_id, group=group)
 
-    GroupMembership.objects.get_or_create(user=join_request.requested_by, group=group, defaults={"role": GroupMembership.Role.MEMBER})
+    gm, _ = GroupMembership.objects.get_or_create(user=join_request.requested_by, group=group, defaults={"role": GroupMembership.Role.MEMBER})
     GroupRequest.objects.filter(id=request_id).delete()
-    messages.success(request, f"Pedido de {join_request.requested_by.username} aceito. Ele agora é membro de “{group.name}”.")
-    return redirect("core:group_detail", slug=slug)
+    feed.publish(FeedEntry.Kind.REQUEST_ACCEPTED, [join_request.requested_by_id], actor=request.user, group=group)
+    return _admin_action_done(
+        request, slug, messages.SUCCESS,
+        f"Pedido de {join_request.requested_by.username} aceito. Ele agora é membro de “{group.name}”.",
+        "includes/join_requests.html",
+        _join_requests_context(group, accepted=[gm], member_count=GroupMembership.objects.filter(group=group).count()),
+    )
 
 @login_required
 @group_admin_required
 def group_reject_request_view(request, slug, request_id):
     if request.method != "POST":
-        messages.error(request, "Operação inválida.")
-        return redirect("core:group_detail", slug=slug)
+        return _admin_action_done(request, slug, messages.ERROR, "Operação inválida.")
 
     group = get_object_or_404(Group, slug=slug)
-    join_request = get_object_or_404(GroupRequest, id=request_id, group=group)
+    join_request = get_object_or_404(GroupRequest.objects.select_related("requested_by"), id=request_id, group=group)
 
     GroupRequest.objects.filter(id=request_id).delete()
-    messages.info(request, f"Pedido de {join_request.requested_by.username} rejeitado.")
-    return redirect("core:group_detail", slug=slug)
+    return _admin_action_done(
+        request, slug, messages.INFO,
+        f"Pedido de {join_request.requested_by.username} rejeitado.",
+        "includes/join_requests.html",
+        _join_requests_context(group),
+    )
+
+@login_required
+@group_admin_required
+@require_http_methods(["POST"])
+def group_bulk_requests_view(request, slug):
+    """
+    Aceita ou rejeita vários pedidos de entrada (ou todos) numa transação:
+    um bulk_create de memberships, um delete e um único registro em lote
+    no change log e no feed.
+    """
+    group = get_object_or_404(Group, slug=slug)
+    action = request.POST.get("action")
+    if action not in ("accept", "reject", "accept_all"):
+        return _admin_action_done(request, slug, messages.ERROR, "Operação inválida.")
+
+    pending = GroupRequest.objects.filter(group=group)
+    if action != "accept_all":
+        ids = [int(i) for i in request.POST.getlist("request_ids") if i.isdigit()]
+        if not ids:
+            return _admin_action_done(request, slug, messages.INFO, "Nenhum pedido selecionado.")
+        pending = pending.filter(id__in=ids)
+
+    accepted = []
+    with transaction.atomic():
+        selected = list(pending.values_list("id", "requested_by_id"))
+        request_ids = [rid for rid, _ in selected]
+        user_ids = [uid for _, uid in selected]
+        if action in ("accept", "accept_all") and user_ids:
+            # Quem já era membro (pedido antigo que sobrou) não entra no log nem na lista.
+            already = set(
+                GroupMembership.objects.filter(group=group, user_id__in=user_ids).values_list("user_id", flat=True)
+            )
+            new_ids = [uid for uid in user_ids if uid not in already]
+            GroupMembership.objects.bulk_create(
+                [GroupMembership(user_id=uid, group=group, role=GroupMembership.Role.MEMBER) for uid in new_ids],
+                ignore_conflicts=True,
+            )
+            # bulk_create não dispara sinais nem devolve pks com ignore_conflicts.
+            accepted = list(
+                GroupMembership.objects.filter(group=group, user_id__in=new_ids).select_related("user")
+            )
+            changelog.record_many(group.pk, accepted, ChangeLogEntry.Op.INSERT)
+            feed.publish(FeedEntry.Kind.REQUEST_ACCEPTED, new_ids, actor=request.user, group=group)
+        GroupRequest.objects.filter(id__in=request_ids).delete()
+
+    if action == "reject":
+        text, level = f"{len(request_ids)} pedido(s) rejeitado(s).", messages.INFO
+    else:
+        text, level = f"{len(request_ids)} pedido(s) aceito(s).", messages.SUCCESS
+    extra = {"accepted": accepted, "member_count": GroupMembership.objects.filter(group=group).count()} if accepted else {}
+    return _admin_action_done(request, slug, level, text, "includes/join_requests.html", _join_requests_context(group, **extra))
 
 @login_required
 def group_leave_view(request, slug):
@@ -356,7 +569,7 @@ def group_leave_view(request, slug):
                 messages.info(request, f"O título de criador de {group} foi transferido para {oldest_member.user.username}.")
             else:
                 
-                group.delete()
+                purge.schedule(group, requested_by=request.user)
                 messages.success(request, f"Você era o último membro. O grupo “{group.name}” foi deletado.")
                 return redirect("core:group_list")
 
@@ -392,13 +605,14 @@ def group_edit_view(request, slug):
 def group_delete_view(request, slug):
     group = get_object_or_404(Group, slug=slug)
     if request.method == "POST":
-        group.delete()
+        purge.schedule(group, requested_by=request.user)
         messages.success(request, "Grupo deletado.")
         return HttpResponseRedirect(reverse("core:group_list"))
     return render(request, "group_list.html", {"group": group})
 
 
 @login_required
+@idempotent
 def game_create_view(request):
     """
     Cria uma partida e, opcionalmente, já a “posta” em 1+ grupos.
@@ -414,21 +628,45 @@ def game_create_view(request):
             game.created_by = request.user
             game.save()
 
-            for gid in group_ids:
-                group = Group.objects.filter(pk=gid).first()
-                if group:
-                    GamePost.objects.get_or_create(game=game, group=group, defaults={"posted_by": request.user})
+            groups = Group.objects.filter(pk__in=[gid for gid in group_ids if gid.isdigit()])
+            for group in groups:
+                GamePost.objects.create(game=game, group=group, posted_by=request.user)
 
             messages.success(request, "Partida criada!")
             return HttpResponseRedirect(reverse("core:game_detail", args=[game.pk]))
     else:
         form = GameForm(user=request.user)
-    groups = [gm.group for gm in GroupMembership.objects.filter(user=request.user)]
+    groups = [
+        gm.group
+        for gm in GroupMembership.objects.filter(user=request.user, group__hidden_at__isnull=True).select_related("group")
+    ]
     return render(request, "game_create.html", {"form": form, "groups": groups})
 
 
+def _archived_game_detail(request, pk: int):
+    """Partida arquivada (core/archive.py): só leitura, direto das tabelas de arquivo."""
+    game = get_object_or_404(ArchivedGame.objects.select_related("created_by"), pk=pk)
+    participations = list(game.participations.select_related("player").order_by("id"))
+    total_pot = sum((game.buy_in + (p.rebuy or 0)) for p in participations)
+    return render(request, "game_archived.html", {
+        "game": game,
+        "participations": participations,
+        "total_pot": total_pot,
+        "can_view_history": request.user.is_authenticated and _can_view_archived(request.user, game),
+    })
+
+
+def _can_view_archived(user, game) -> bool:
+    """A regra do game_history_view para uma ArchivedGame: os grupos ficam em group_ids."""
+    return game.created_by_id == user.pk or GroupMembership.objects.filter(
+        group_id__in=game.group_ids, group__hidden_at__isnull=True, user=user,
+    ).exists()
+
+
 def game_detail_view(request, pk: int):
-    game = get_object_or_404(Game, pk=pk)
+    game = Game.objects.filter(pk=pk).first()
+    if game is None:
+        return _archived_game_detail(request, pk)
 
     session_key = f"last_group_for_game_{pk}"
 
@@ -461,6 +699,10 @@ def game_detail_view(request, pk: int):
         created_by=request.user,
     ).exists()
     can_edit_game = is_creator or is_group_creator
+    # Mesma regra do game_history_view.
+    can_view_history = is_creator or request.user.is_authenticated and GroupMembership.objects.filter(
+        group__posts__game=game, group__hidden_at__isnull=True, user=request.user,
+    ).exists()
 
     participations = game.participations.select_related("player").all()
 
@@ -476,11 +718,106 @@ def game_detail_view(request, pk: int):
             "from_group": from_group,
             "total_pot": total_pot,
             "can_edit_game": can_edit_game,
+            "can_view_history": can_view_history,
+            "live_version": live.current_version(game.pk),
         },
     )
 
+
+async def _live_catch_up(pk: int, since: int):
+    """Snapshot direto para quem chega atrasado e não há mensagem em memória."""
+    version = live.current_version(pk)
+    if since < version and not live.has_watchers(pk):
+        payload = await sync_to_async(live.snapshot)(pk)
+        if payload:
+            return {**payload, "version": version}
+    return None
+
+
+async def _live_denied(request, pk: int):
+    """
+    Mesma regra do histórico: só o criador ou membros de um grupo visível em
+    que a partida foi postada. Sem redirect para o login, que o EventSource
+    e o fetch não seguiriam: quem não está logado recebe 403.
+    """
+    game = await Game.objects.only("id", "created_by_id").filter(pk=pk).afirst()
+    if game is None:
+        raise Http404
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponseForbidden("Faça login para acompanhar a partida.")
+    if game.created_by_id == user.pk:
+        return None
+    is_member = await GroupMembership.objects.filter(
+        group__posts__game_id=pk, group__hidden_at__isnull=True, user=user,
+    ).aexists()
+    return None if is_member else HttpResponseForbidden("Você não participa dos grupos desta partida.")
+
+
+def _live_since(request) -> int:
+    raw = request.headers.get("Last-Event-ID") or request.GET.get("since") or "0"
+    return int(raw) if raw.isdigit() else 0
+
+
+async def game_live_stream_view(request, pk: int):
+    """
+    Server-Sent Events com as mudanças de participação da partida.
+    Requer um servidor ASGI (pokerdex/asgi.py).
+    """
+    denied = await _live_denied(request, pk)
+    if denied:
+        return denied
+    if not isinstance(request, ASGIRequest):
+        # Sob WSGI o stream prenderia um worker; 204 encerra o EventSource.
+        return HttpResponse(status=204)
+
+    since = _live_since(request)
+    catch_up = await _live_catch_up(pk, since)
+
+    async def events():
+        nonlocal since
+        if catch_up:
+            since = catch_up["version"]
+            yield f"id: {since}\nevent: participations\ndata: {json.dumps(catch_up)}\n\n"
+        async with live.watch(pk) as watcher:
+            while True:
+                message = await live.next_message(watcher, pk, since, live.KEEPALIVE_SECONDS)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                since = message["version"]
+                yield f"id: {since}\nevent: participations\ndata: {json.dumps(message)}\n\n"
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def game_live_poll_view(request, pk: int):
+    """
+    Long-poll: responde assim que houver versão maior que ?since=,
+    ou 204 depois de LONG_POLL_SECONDS. Só sob ASGI: no WSGI cada espera
+    prenderia uma thread do gthread por até LONG_POLL_SECONDS.
+    """
+    denied = await _live_denied(request, pk)
+    if denied:
+        return denied
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse("O modo ao vivo requer um servidor ASGI.", status=501)
+
+    since = _live_since(request)
+    message = await _live_catch_up(pk, since)
+    if message is None:
+        async with live.watch(pk) as watcher:
+            message = await live.next_message(watcher, pk, since, live.LONG_POLL_SECONDS)
+    if message is None:
+        return HttpResponse(status=204)
+    return JsonResponse(message)
+
 @login_required
 @require_http_methods(["GET", "POST"])
+@idempotent
 def game_edit_view(request, pk: int):
     game = get_object_or_404(Game, pk=pk)
     is_group_creator = Group.objects.filter(
@@ -544,18 +881,20 @@ def game_delete_view(request, pk: int):
     ).exists()
     if game.created_by_id != request.user.id and not is_group_creator:
         return HttpResponseForbidden("Você não pode excluir esta partida.")
-    game.delete()
+    purge.schedule(game, requested_by=request.user)
     messages.success(request, "Partida excluída.")
     return redirect("core:group_list")
 
 @login_required
+@idempotent
 def participation_add_view(request, pk: int):
     game = get_object_or_404(Game, pk=pk)
     if request.method == "POST":
         form = GameParticipationForm(request.POST, game=game)
         if form.is_valid():
             try:
-                form.save()
+                with transaction.atomic():
+                    form.save()
                 return redirect("core:game_detail", pk=game.pk)
             except IntegrityError:
                 form.add_error("player", "Este jogador já foi adicionado a esta partida.")
@@ -566,6 +905,7 @@ def participation_add_view(request, pk: int):
 
 @login_required
 @require_http_methods(["GET", "POST"])
+@idempotent
 def participation_edit_view(request, pk: int, part_id: int):
     game = get_object_or_404(Game, pk=pk)
     participation = get_object_or_404(GameParticipation, pk=part_id, game=game)
@@ -599,6 +939,30 @@ def participation_edit_view(request, pk: int, part_id: int):
     })
 
 
+@login_required
+def game_history_view(request, pk: int):
+    """Linha do tempo das alterações da partida e dos resultados, para membros dos grupos."""
+    game = Game.objects.filter(pk=pk).first()
+    if game is None:
+        game = get_object_or_404(ArchivedGame, pk=pk)
+        allowed = _can_view_archived(request.user, game)
+    else:
+        allowed = game.created_by_id == request.user.id or GroupMembership.objects.filter(
+            group__posts__game=game, group__hidden_at__isnull=True, user=request.user,
+        ).exists()
+    if not allowed:
+        return HttpResponseForbidden("Você não participa dos grupos desta partida.")
+
+    before = request.GET.get("before")
+    entries = audit.timeline(
+        game.pk, before=int(before) if before and before.isdigit() else None,
+        archived=isinstance(game, ArchivedGame),
+    )
+    next_before = entries[-1].pk if len(entries) == audit.PAGE_SIZE else None
+    audit.describe(entries)
+    return render(request, "game_history.html", {"game": game, "entries": entries, "next_before": next_before})
+
+
 @login_required
 @require_http_methods(["POST"])
 def participation_delete_view(request, pk: int, part_id: int):
@@ -0,0 +1,42 @@
+"""
+Aquecimento de um worker antes de receber tráfego (ver gunicorn.conf.py):
+compila os templates no cached loader e monta o resolver de URLs, para que
+as primeiras requisições após um deploy não paguem esses custos. O banco
+fica de fora: a conexão do Django é por thread, e uma aberta aqui não seria
+usada pelas threads que atendem as requisições.
+"""
+import time
+from pathlib import Path
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import get_resolver, reverse
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+
+def _warm_templates() -> int:
+    count = 0
+    for path in TEMPLATE_DIR.rglob("*.html"):
+        try:
+            get_template(path.relative_to(TEMPLATE_DIR).as_posix())
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            continue
+        count += 1
+    return count
+
+
+def _warm_urls():
+    resolver = get_resolver()
+    resolver.resolve("/")
+    reverse("core:dashboard")
+
+
+def warm_up() -> dict:
+    """Executa todas as etapas e devolve a duração de cada uma (em segundos)."""
+    timings = {}
+    for name, step in (("templates", _warm_templates), ("urls", _warm_urls)):
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+    return timings
@@ -0,0 +1,58 @@
+"""
+Configuração de produção do gunicorn:
+
+    gunicorn -c gunicorn.conf.py
+
+Ajustável por variáveis de ambiente: WEB_CONCURRENCY (workers),
+GUNICORN_THREADS, GUNICORN_WORKER (gthread ou uvicorn) e PORT.
+"""
+import multiprocessing
+import os
+
+_cpus = multiprocessing.cpu_count()
+_worker = os.getenv("GUNICORN_WORKER", "gthread")
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+if _worker == "uvicorn":
+    # Worker assíncrono: necessário para o SSE do modo ao vivo.
+    wsgi_app = "pokerdex.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "pokerdex.wsgi:application"
+    worker_class = "gthread"
+    threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# O SQLite só tem um escritor por vez: mais processos não aumentam a vazão de
+# escrita, então o padrão é um worker por CPU (mínimo 2) com threads.
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, _cpus)))
+
+# Carrega o Django uma vez no master; os workers herdam o código já importado.
+preload_app = True
+
+# Recicla workers aos poucos (vazamentos de memória), sem reiniciar todos juntos.
+max_requests = 1000
+max_requests_jitter = 100
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # Conexões abertas no master (preload) não podem ser compartilhadas.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    from core.warmup import warm_up
+
+    timings = warm_up()
+    worker.log.info(
+        "warm-up: %s", ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in timings.items())
+    )
@@ -1,5 +1,7 @@
 import os
 from django.core.asgi import get_asgi_application
 
+# Necessário para o modo ao vivo das partidas (SSE), por exemplo:
+#   uvicorn pokerdex.asgi:application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pokerdex.settings')
 application = get_asgi_application()
@@ -9,6 +9,16 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Toda transação já começa com o lock de escrita (BEGIN IMMEDIATE):
+            # uma transação DEFERRED que leu antes de escrever não consegue
+            # esperar pelo lock e falha na hora com "database is locked".
+            'transaction_mode': 'IMMEDIATE',
+            # Segundos esperando o lock de escrita antes de desistir.
+            'timeout': 20,
+            # WAL: leituras não esperam pelo escritor.
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+        },
     }
 }
 
@@ -39,16 +49,19 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
 ]
 
-LOGIN_REDIRECT_URL = "core:group_list"
+LOGIN_REDIRECT_URL = "core:dashboard"
 LOGIN_URL = '/account/login'
 LOGOUT_REDIRECT_URL = LOGIN_URL
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.ThumbnailMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.AuditActorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -65,12 +78,32 @@ STATICFILES_DIRS = [
 
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+MEDIA_URL = "/media/"
+
+MEDIA_ROOT = BASE_DIR / "media"
+
+# collectstatic gera nomes com hash e as variantes .gz/.br (core/staticfiles.py);
+# o core.middleware.StaticFilesMiddleware serve o STATIC_ROOT com cache imutável.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.staticfiles.CompressedManifestStaticFilesStorage"},
+}
+
+_TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],  
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Em produção os templates são compilados uma vez por processo
+            # (e aquecidos no start do worker, ver core/warmup.py).
+            'loaders': _TEMPLATE_LOADERS if DEBUG else [
+                ("django.template.loaders.cached.Loader", _TEMPLATE_LOADERS),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -82,6 +115,17 @@ TEMPLATES = [
 ]
 
 
+CACHES = {
+    # Por processo; os fragmentos em cache usam chaves versionadas pelo
+    # Group.change_seq, então workers diferentes nunca servem dados velhos.
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "pokerdex",
+        "TIMEOUT": 600,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
 TIME_ZONE = 'America/Sao_Paulo'
 
 USE_TZ = True